@@ -1,22 +1,113 @@
 from sqlmodel import SQLModel, create_engine, Session
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+import logging
 import sys
 from pathlib import Path
 
-# Add parent directory to path for config import
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-
 try:
-    from config import DATABASE_URL
+    from config import DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW
 except ImportError:
-    # Fallback if config.py not available
-    DATABASE_URL = "sqlite:///./devbox.db"
+    # Not on the path yet: look in the project root, then fall back to defaults
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    try:
+        from config import DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW
+    except ImportError:
+        DATABASE_URL = "sqlite:///./devbox.db"
+        DB_POOL_SIZE = 20
+        DB_MAX_OVERFLOW = 40
+
+logger = logging.getLogger(__name__)
+
+# Sync endpoints run on FastAPI's worker thread pool (40 threads by default);
+# size the connection pool so those threads don't queue on a free connection.
+# In-memory SQLite uses a single shared connection and takes no pool sizing.
+_url = make_url(DATABASE_URL)
+_IN_MEMORY = _url.get_backend_name() == "sqlite" and _url.database in (None, "", ":memory:")
+pool_kwargs = {}
+if not _IN_MEMORY:
+    pool_kwargs = {"pool_size": DB_POOL_SIZE, "max_overflow": DB_MAX_OVERFLOW}
+
+engine = create_engine(
+    DATABASE_URL,
+    echo=False,
+    connect_args={"check_same_thread": False},
+    query_cache_size=2000,
+    **pool_kwargs
+)
+
+# File-backed SQLite: WAL lets readers proceed while a write is in flight,
+# busy_timeout waits on the lock instead of failing with "database is locked".
+if _url.get_backend_name() == "sqlite" and not _IN_MEMORY:
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragma(dbapi_conn, _):
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute("PRAGMA busy_timeout=30000")
+        cur.execute("PRAGMA temp_store=MEMORY")
+        cur.execute("PRAGMA cache_size=-64000")
+        cur.close()
+
+# expire_on_commit=False: objects stay readable after commit without a reload
+# SELECT, so write endpoints can return them directly.
+SessionLocal = sessionmaker(bind=engine, class_=Session, expire_on_commit=False, autoflush=False)
 
-engine = create_engine(DATABASE_URL, echo=False, connect_args={"check_same_thread": False})
+# Stored in SQLite's PRAGMA user_version once the schema is in place.
+# Bump it whenever models.py gains tables or indexes.
+SCHEMA_VERSION = 1
 
 def init_db():
-    """Initialize database tables"""
-    SQLModel.metadata.create_all(engine)
+    """Initialize database tables, unless the schema is already current"""
+    from . import models  # noqa: F401 - registers the tables on SQLModel.metadata
+
+    if engine.dialect.name != "sqlite":
+        SQLModel.metadata.create_all(engine)
+        return
+    with engine.begin() as conn:
+        if conn.exec_driver_sql("PRAGMA user_version").scalar() == SCHEMA_VERSION:
+            return
+        SQLModel.metadata.create_all(conn)
+        _upgrade_username_index(conn)
+        # create_all() skips existing tables along with their indexes, so add
+        # any index introduced since the database was created
+        for table in SQLModel.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+        conn.exec_driver_sql(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+def _upgrade_username_index(conn):
+    """Make ix_user_username unique on databases created before it was.
+
+    create_all() leaves existing indexes alone, and user creation relies on
+    the unique index for INSERT ... ON CONFLICT.
+    """
+    unique = {row[1]: row[2] for row in conn.exec_driver_sql('PRAGMA index_list("user")')}
+    if not unique.get("ix_user_username"):
+        _merge_duplicate_users(conn)
+        conn.exec_driver_sql("DROP INDEX IF EXISTS ix_user_username")
+        conn.exec_driver_sql('CREATE UNIQUE INDEX ix_user_username ON "user" (username)')
+
+def _merge_duplicate_users(conn):
+    """Fold users sharing a username into the oldest row.
+
+    The old check-then-insert user creation could race and store a username
+    twice, which would make the unique index fail to build. Projects owned by
+    a duplicate move over to the row that is kept.
+    """
+    dupes = conn.exec_driver_sql(
+        'SELECT username, MIN(id) FROM "user" GROUP BY username HAVING COUNT(*) > 1'
+    ).all()
+    for username, keep_id in dupes:
+        conn.exec_driver_sql(
+            'UPDATE project SET owner_id = ? WHERE owner_id IN '
+            '(SELECT id FROM "user" WHERE username = ? AND id != ?)',
+            (keep_id, username, keep_id),
+        )
+        conn.exec_driver_sql('DELETE FROM "user" WHERE username = ? AND id != ?', (username, keep_id))
+        logger.warning(f"Merged duplicate users named {username!r} into user {keep_id}")
 
 def get_session():
     """Get database session"""
-    return Session(engine)
+    return SessionLocal()
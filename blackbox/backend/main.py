@@ -1,15 +1,19 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional, List
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, field_validator
+from typing import Any, Optional, List
 from datetime import datetime
+from urllib.parse import quote, unquote
 from sqlmodel import select
+from sqlalchemy import bindparam, func, insert, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import load_only, raiseload
+import asyncio
 import logging
-import sys
-from pathlib import Path
-
-# Add parent directory to path for config import
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+import re
+import orjson
 
 from .models import (
     User, Project, Session, CodeSnippet, Run, Event,
@@ -17,6 +21,7 @@ from .models import (
 )
 from .db import init_db, get_session
 
+# .db has already put the project root on sys.path if config needed it
 try:
     from config import LOG_LEVEL
 except ImportError:
@@ -32,7 +37,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Dev Blackbox API",
     description="A comprehensive API for logging and tracking development activities",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS Configuration - adjust origins as needed
@@ -44,6 +50,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses (list endpoints) for clients that accept gzip;
+# requests sends "Accept-Encoding: gzip, deflate" by default
+app.add_middleware(GZipMiddleware, minimum_size=512)
+
 # ===================== Request/Response Schemas =====================
 
 class UserCreate(BaseModel):
@@ -76,6 +86,14 @@ class RunUpdate(BaseModel):
     stderr: Optional[str] = None
     return_value: Optional[str] = None
 
+    @field_validator("status")
+    @classmethod
+    def _status_not_null(cls, value):
+        # Leaving status out keeps it; only the other fields can be cleared with null
+        if value is None:
+            raise ValueError("status cannot be null")
+        return value
+
 class EventCreate(BaseModel):
     project_id: int
     run_id: Optional[int] = None
@@ -83,6 +101,68 @@ class EventCreate(BaseModel):
     message: Optional[str] = None
     metadata_json: Optional[str] = None
 
+class BatchCall(BaseModel):
+    method: str = "GET"
+    path: str
+    payload: Optional[Any] = None
+    input_from: int = -1  # index of a call this one waits for; -1 for none
+
+# Summary views omit the heavy text columns (code, stdout/stderr, metadata)
+# for list screens that only need to show a table of rows.
+
+class SnippetSummary(BaseModel):
+    id: int
+    project_id: Optional[int] = None
+    filename: Optional[str] = None
+    language: Optional[str] = None
+    created_at: datetime
+
+class RunSummary(BaseModel):
+    id: int
+    session_id: Optional[int] = None
+    snippet_id: Optional[int] = None
+    status: Optional[RunStatus] = None
+    started_at: Optional[datetime] = None
+    ended_at: Optional[datetime] = None
+    duration: Optional[float] = None
+
+class EventSummary(BaseModel):
+    id: int
+    timestamp: datetime
+    project_id: Optional[int] = None
+    run_id: Optional[int] = None
+    event_type: Optional[EventType] = None
+    message: Optional[str] = None
+
+# ===================== Query Helpers =====================
+
+def with_loaders(stmt, *opts):
+    """Apply raiseload("*") plus any explicit eager loaders to a select.
+
+    List endpoints go through this so a relationship that wasn't requested
+    with selectinload() raises instead of lazy-loading once per row.
+    """
+    return stmt.options(raiseload("*"), *opts)
+
+def _stream_json(stmt, schema=None):
+    """Serialize query results as a JSON array, one row at a time.
+
+    Rows are fetched in chunks of 500 (yield_per) and written out as they
+    arrive, so memory stays flat however large `limit` is. With `schema`,
+    each row is converted to that summary model first.
+    """
+    with get_session() as s:
+        yield b"["
+        first = True
+        for row in s.exec(stmt.execution_options(yield_per=500)):
+            if schema is not None:
+                row = schema.model_validate(row, from_attributes=True)
+            if not first:
+                yield b","
+            first = False
+            yield orjson.dumps(row.model_dump())
+        yield b"]"
+
 # ===================== Startup =====================
 
 @app.on_event("startup")
@@ -108,7 +188,7 @@ def health_check():
     return {
         "status": "healthy",
         "database": "not_checked",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": datetime.utcnow(),
         "message": "Use /health/full for database check"
     }
 
@@ -116,13 +196,28 @@ def health_check():
 def health_check_full():
     """Full health check with database test"""
     try:
-        # Test database connection
+        # SELECT 1 checks the connection without touching any table
+        with get_session() as s:
+            s.exec(text("SELECT 1")).one()
+        return {
+            "status": "healthy",
+            "database": "connected",
+            "timestamp": datetime.utcnow()
+        }
+    except Exception as e:
+        logger.error(f"Health check failed: {e}")
+        raise HTTPException(status_code=503, detail="Service unhealthy")
+
+@app.get("/health/deep", tags=["Health"])
+def health_check_deep():
+    """Health check that also reads from the user table"""
+    try:
         with get_session() as s:
             s.exec(select(User).limit(1)).first()
         return {
             "status": "healthy",
             "database": "connected",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow()
         }
     except Exception as e:
         logger.error(f"Health check failed: {e}")
@@ -134,18 +229,19 @@ def health_check_full():
 def create_user(data: UserCreate):
     """Create a new user"""
     try:
-        user = User(username=data.username)
+        stmt = (
+            sqlite_insert(User)
+            .values(username=data.username)
+            .on_conflict_do_nothing(index_elements=["username"])
+            .returning(User.id)
+        )
         with get_session() as s:
-            # Check if user already exists
-            existing = s.exec(select(User).where(User.username == data.username)).first()
-            if existing:
+            user_id = s.exec(stmt).scalar()
+            if user_id is None:
                 raise HTTPException(status_code=400, detail=f"User '{data.username}' already exists")
-            
-            s.add(user)
             s.commit()
-            s.refresh(user)
-        logger.info(f"Created user: {user.username} (ID: {user.id})")
-        return {"id": user.id, "username": user.username}
+        logger.info(f"Created user: {data.username} (ID: {user_id})")
+        return {"id": user_id, "username": data.username}
     except HTTPException:
         raise
     except Exception as e:
@@ -160,11 +256,33 @@ def get_user(user_id: int):
             raise HTTPException(status_code=404, detail="User not found")
         return user
 
+_USER_BY_NAME = with_loaders(select(User)).where(User.username == bindparam("username")).limit(1)
+
+@app.get("/users/by-name/{username:path}")
+def get_user_by_name(username: str):
+    """Look a user up by username (uses the unique username index)"""
+    with get_session() as s:
+        user = s.exec(_USER_BY_NAME, params={"username": username}).first()
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        return user
+
+# Built once; the page bounds are bind parameters so every request reuses the
+# same compiled SQL. Ids start at 1, so after_id=0 means "from the start".
+_USERS_PAGE = (
+    with_loaders(select(User))
+    .where(User.id > bindparam("after_id"))
+    .order_by(User.id)
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+
 @app.get("/users")
-def list_users(skip: int = 0, limit: int = 100):
+def list_users(skip: int = 0, limit: int = 100, after_id: Optional[int] = None):
     """List all users with pagination"""
+    params = {"after_id": after_id or 0, "skip": skip, "limit": limit}
     with get_session() as s:
-        users = s.exec(select(User).offset(skip).limit(limit)).all()
+        users = s.exec(_USERS_PAGE, params=params).all()
     return users
 
 # ===================== Project Endpoints =====================
@@ -179,7 +297,6 @@ def create_project(data: ProjectCreate):
     with get_session() as s:
         s.add(project)
         s.commit()
-        s.refresh(project)
     return {"id": project.id, "name": project.name}
 
 @app.get("/projects/{project_id}")
@@ -190,14 +307,42 @@ def get_project(project_id: int):
             raise HTTPException(status_code=404, detail="Project not found")
         return project
 
+# Names aren't unique; the oldest project with the name wins
+_PROJECT_BY_NAME = (
+    with_loaders(select(Project))
+    .where(Project.name == bindparam("name"))
+    .order_by(Project.id)
+    .limit(1)
+)
+
+@app.get("/projects/by-name/{name:path}")
+def get_project_by_name(name: str):
+    """Look a project up by name (uses the name index)"""
+    with get_session() as s:
+        project = s.exec(_PROJECT_BY_NAME, params={"name": name}).first()
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
+        return project
+
+_PROJECTS_PAGE = (
+    with_loaders(select(Project))
+    .where(Project.id > bindparam("after_id"))
+    .order_by(Project.id)
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+_PROJECTS_BY_OWNER_PAGE = _PROJECTS_PAGE.where(Project.owner_id == bindparam("owner_id"))
+
 @app.get("/projects")
-def list_projects(skip: int = 0, limit: int = 100, owner_id: Optional[int] = None):
+def list_projects(skip: int = 0, limit: int = 100, owner_id: Optional[int] = None, after_id: Optional[int] = None):
     """List all projects with pagination"""
+    params = {"after_id": after_id or 0, "skip": skip, "limit": limit}
+    stmt = _PROJECTS_PAGE
+    if owner_id:
+        stmt = _PROJECTS_BY_OWNER_PAGE
+        params["owner_id"] = owner_id
     with get_session() as s:
-        stmt = select(Project)
-        if owner_id:
-            stmt = stmt.where(Project.owner_id == owner_id)
-        projects = s.exec(stmt.offset(skip).limit(limit)).all()
+        projects = s.exec(stmt, params=params).all()
     return projects
 
 # ===================== Session Endpoints =====================
@@ -208,7 +353,6 @@ def create_session(data: SessionCreate):
     with get_session() as s:
         s.add(session)
         s.commit()
-        s.refresh(session)
     return {"id": session.id, "project_id": session.project_id, "started_at": session.started_at}
 
 @app.get("/sessions/{session_id}")
@@ -220,13 +364,15 @@ def get_session_detail(session_id: int):
         return session
 
 @app.get("/sessions")
-def list_sessions(project_id: Optional[int] = None, skip: int = 0, limit: int = 100):
+def list_sessions(project_id: Optional[int] = None, skip: int = 0, limit: int = 100, after_id: Optional[int] = None):
     """List all sessions with pagination"""
     with get_session() as s:
-        stmt = select(Session)
+        stmt = with_loaders(select(Session))
         if project_id:
             stmt = stmt.where(Session.project_id == project_id)
-        sessions = s.exec(stmt.offset(skip).limit(limit)).all()
+        if after_id is not None:
+            stmt = stmt.where(Session.id > after_id)
+        sessions = s.exec(stmt.order_by(Session.id).offset(skip).limit(limit)).all()
     return sessions
 
 @app.patch("/sessions/{session_id}/end")
@@ -238,7 +384,6 @@ def end_session(session_id: int):
         session.ended_at = datetime.utcnow()
         s.add(session)
         s.commit()
-        s.refresh(session)
     return session
 
 # ===================== CodeSnippet Endpoints =====================
@@ -254,7 +399,6 @@ def create_snippet(data: CodeSnippetCreate):
     with get_session() as s:
         s.add(snippet)
         s.commit()
-        s.refresh(snippet)
     return {"id": snippet.id, "project_id": snippet.project_id, "filename": snippet.filename}
 
 @app.get("/snippets/{snippet_id}")
@@ -266,16 +410,19 @@ def get_snippet(snippet_id: int):
         return snippet
 
 @app.get("/snippets")
-def list_snippets(project_id: Optional[int] = None, language: Optional[str] = None, skip: int = 0, limit: int = 100):
-    """List all code snippets with pagination"""
-    with get_session() as s:
-        stmt = select(CodeSnippet)
-        if project_id:
-            stmt = stmt.where(CodeSnippet.project_id == project_id)
-        if language:
-            stmt = stmt.where(CodeSnippet.language == language)
-        snippets = s.exec(stmt.offset(skip).limit(limit)).all()
-    return snippets
+def list_snippets(project_id: Optional[int] = None, language: Optional[str] = None, skip: int = 0, limit: int = 100, after_id: Optional[int] = None, summary: bool = False):
+    """List all code snippets with pagination (summary=true omits the code)"""
+    stmt = with_loaders(select(CodeSnippet))
+    if project_id:
+        stmt = stmt.where(CodeSnippet.project_id == project_id)
+    if language:
+        stmt = stmt.where(CodeSnippet.language == language)
+    if after_id is not None:
+        stmt = stmt.where(CodeSnippet.id > after_id)
+    if summary:
+        stmt = stmt.options(load_only(*(getattr(CodeSnippet, f) for f in SnippetSummary.model_fields)))
+    stmt = stmt.order_by(CodeSnippet.id).offset(skip).limit(limit)
+    return StreamingResponse(_stream_json(stmt, SnippetSummary if summary else None), media_type="application/json")
 
 # ===================== Run Endpoints =====================
 
@@ -285,7 +432,6 @@ def create_run(data: RunCreate):
     with get_session() as s:
         s.add(run)
         s.commit()
-        s.refresh(run)
     return {"id": run.id, "session_id": run.session_id, "status": run.status}
 
 @app.get("/runs/{run_id}")
@@ -297,16 +443,19 @@ def get_run(run_id: int):
         return run
 
 @app.get("/runs")
-def list_runs(session_id: Optional[int] = None, status: Optional[RunStatus] = None, skip: int = 0, limit: int = 100):
-    """List all runs with pagination"""
-    with get_session() as s:
-        stmt = select(Run)
-        if session_id:
-            stmt = stmt.where(Run.session_id == session_id)
-        if status:
-            stmt = stmt.where(Run.status == status)
-        runs = s.exec(stmt.offset(skip).limit(limit)).all()
-    return runs
+def list_runs(session_id: Optional[int] = None, status: Optional[RunStatus] = None, skip: int = 0, limit: int = 100, after_id: Optional[int] = None, summary: bool = False):
+    """List all runs with pagination (summary=true omits stdout/stderr)"""
+    stmt = with_loaders(select(Run))
+    if session_id:
+        stmt = stmt.where(Run.session_id == session_id)
+    if status:
+        stmt = stmt.where(Run.status == status)
+    if after_id is not None:
+        stmt = stmt.where(Run.id > after_id)
+    if summary:
+        stmt = stmt.options(load_only(*(getattr(Run, f) for f in RunSummary.model_fields)))
+    stmt = stmt.order_by(Run.id).offset(skip).limit(limit)
+    return StreamingResponse(_stream_json(stmt, RunSummary if summary else None), media_type="application/json")
 
 @app.patch("/runs/{run_id}")
 def update_run(run_id: int, data: RunUpdate):
@@ -315,24 +464,12 @@ def update_run(run_id: int, data: RunUpdate):
         if not run:
             raise HTTPException(status_code=404, detail="Run not found")
         
-        if data.status is not None:
-            run.status = data.status
-        if data.started_at is not None:
-            run.started_at = data.started_at
-        if data.ended_at is not None:
-            run.ended_at = data.ended_at
-        if data.duration is not None:
-            run.duration = data.duration
-        if data.stdout is not None:
-            run.stdout = data.stdout
-        if data.stderr is not None:
-            run.stderr = data.stderr
-        if data.return_value is not None:
-            run.return_value = data.return_value
+        # Only fields the client actually sent; an explicit null clears the field
+        for field, value in data.model_dump(exclude_unset=True).items():
+            setattr(run, field, value)
         
         s.add(run)
         s.commit()
-        s.refresh(run)
     return run
 
 # ===================== Event Endpoints =====================
@@ -347,11 +484,27 @@ def create_event(data: EventCreate):
         metadata_json=data.metadata_json
     )
     with get_session() as s:
+        if not s.get(Project, data.project_id):
+            raise HTTPException(status_code=404, detail="Project not found")
         s.add(event)
         s.commit()
-        s.refresh(event)
     return {"id": event.id, "timestamp": event.timestamp}
 
+@app.post("/events/bulk", status_code=201)
+def create_events(data: List[EventCreate]):
+    """Create many events in a single transaction"""
+    if not data:
+        return {"created": 0}
+    project_ids = {e.project_id for e in data}
+    with get_session() as s:
+        found = set(s.exec(select(Project.id).where(Project.id.in_(project_ids))).all())
+        if found != project_ids:
+            missing = sorted(project_ids - found)
+            raise HTTPException(status_code=404, detail=f"Project not found: {missing}")
+        s.exec(insert(Event), params=[e.model_dump() for e in data])
+        s.commit()
+    return {"created": len(data)}
+
 @app.get("/events/{event_id}")
 def get_event(event_id: int):
     with get_session() as s:
@@ -366,43 +519,52 @@ def list_events(
     run_id: Optional[int] = None,
     event_type: Optional[EventType] = None,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    summary: bool = False
 ):
-    """List all events with pagination"""
-    with get_session() as s:
-        stmt = select(Event)
-        if project_id:
-            stmt = stmt.where(Event.project_id == project_id)
-        if run_id:
-            stmt = stmt.where(Event.run_id == run_id)
-        if event_type:
-            stmt = stmt.where(Event.event_type == event_type)
-        events = s.exec(stmt.offset(skip).limit(limit)).all()
-    return events
+    """List all events with pagination (summary=true omits metadata)"""
+    stmt = with_loaders(select(Event))
+    if project_id:
+        stmt = stmt.where(Event.project_id == project_id)
+    if run_id:
+        stmt = stmt.where(Event.run_id == run_id)
+    if event_type:
+        stmt = stmt.where(Event.event_type == event_type)
+    if after_id is not None:
+        stmt = stmt.where(Event.id > after_id)
+    if summary:
+        stmt = stmt.options(load_only(*(getattr(Event, f) for f in EventSummary.model_fields)))
+    stmt = stmt.order_by(Event.id).offset(skip).limit(limit)
+    return StreamingResponse(_stream_json(stmt, EventSummary if summary else None), media_type="application/json")
 
 # ===================== Stats Endpoints =====================
 
+# Zero-filled buckets so enum values with no rows still show up in the summary
+_EMPTY_RUNS_BY_STATUS = {status.value: 0 for status in RunStatus}
+_EMPTY_EVENTS_BY_TYPE = {etype.value: 0 for etype in EventType}
+
 @app.get("/stats/summary")
 def stats_summary():
     with get_session() as s:
-        total_users = len(s.exec(select(User)).all())
-        total_projects = len(s.exec(select(Project)).all())
-        total_sessions = len(s.exec(select(Session)).all())
-        total_snippets = len(s.exec(select(CodeSnippet)).all())
-        total_runs = len(s.exec(select(Run)).all())
-        total_events = len(s.exec(select(Event)).all())
+        total_users = s.exec(select(func.count()).select_from(User)).one()
+        total_projects = s.exec(select(func.count()).select_from(Project)).one()
+        total_sessions = s.exec(select(func.count()).select_from(Session)).one()
+        total_snippets = s.exec(select(func.count()).select_from(CodeSnippet)).one()
+        total_runs = s.exec(select(func.count()).select_from(Run)).one()
+        total_events = s.exec(select(func.count()).select_from(Event)).one()
         
         # runs by status
-        runs_by_status = {}
-        for status in RunStatus:
-            count = len(s.exec(select(Run).where(Run.status == status)).all())
-            runs_by_status[status.value] = count
+        runs_by_status = _EMPTY_RUNS_BY_STATUS.copy()
+        for status, count in s.exec(select(Run.status, func.count()).group_by(Run.status)).all():
+            if status is not None:
+                runs_by_status[status.value] = count
         
         # events by type
-        events_by_type = {}
-        for etype in EventType:
-            count = len(s.exec(select(Event).where(Event.event_type == etype)).all())
-            events_by_type[etype.value] = count
+        events_by_type = _EMPTY_EVENTS_BY_TYPE.copy()
+        for etype, count in s.exec(select(Event.event_type, func.count()).group_by(Event.event_type)).all():
+            if etype is not None:
+                events_by_type[etype.value] = count
     
     return {
         "total_users": total_users,
@@ -414,3 +576,175 @@ def stats_summary():
         "runs_by_status": runs_by_status,
         "events_by_type": events_by_type
     }
+
+# ===================== Batch Endpoint =====================
+
+# Room for a full daemon batch: 32 events, each with a user and a project to create
+MAX_BATCH_CALLS = 100
+
+# {"$ref": "2.id"} in a payload, or a "$2.id" path segment, refers to field
+# "id" of call 2's result; dotted paths reach into nested objects. Only these
+# exact forms count, so free text such as a commit message is never rewritten.
+_BATCH_REF = re.compile(r"(\d+)((?:\.\w+)+)")
+
+def _ref_match(value):
+    """The reference a payload value or path segment holds, or None."""
+    if isinstance(value, dict) and len(value) == 1 and isinstance(value.get("$ref"), str):
+        return _BATCH_REF.fullmatch(value["$ref"])
+    if isinstance(value, str) and value.startswith("$"):
+        return _BATCH_REF.fullmatch(value[1:])
+    return None
+
+def _batch_refs(value) -> set:
+    """Indexes of the calls a payload value refers to."""
+    match = _ref_match(value) if isinstance(value, dict) else None
+    if match:
+        return {int(match.group(1))}
+    if isinstance(value, dict):
+        return set().union(*map(_batch_refs, value.values()))
+    if isinstance(value, list):
+        return set().union(*map(_batch_refs, value))
+    return set()
+
+def _path_refs(path: str) -> set:
+    """Indexes of the calls a path's "$N.field" segments refer to."""
+    refs = set()
+    for segment in path.split("?")[0].split("/"):
+        match = _ref_match(segment)
+        if match:
+            refs.add(int(match.group(1)))
+    return refs
+
+def _batch_lookup(results, match):
+    value = results[int(match.group(1))]["body"]
+    for key in match.group(2).lstrip(".").split("."):
+        value = value[key]
+    return value
+
+def _batch_substitute(value, results):
+    """Replace {"$ref": "N.field"} objects with values from earlier results."""
+    if isinstance(value, dict):
+        match = _ref_match(value)
+        if match:
+            return _batch_lookup(results, match)
+        return {k: _batch_substitute(v, results) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_batch_substitute(v, results) for v in value]
+    return value
+
+def _substitute_path(path: str, results) -> str:
+    """Replace "$N.field" path segments with values from earlier results."""
+    path, sep, query = path.partition("?")
+    segments = []
+    for segment in path.split("/"):
+        match = _ref_match(segment)
+        segments.append(quote(str(_batch_lookup(results, match)), safe="") if match else segment)
+    return "/".join(segments) + sep + query
+
+def _is_batch_path(path: str) -> bool:
+    """Whether a call's path routes to /batch once decoded, however it is spelled."""
+    path = unquote(path.partition("?")[0])
+    return re.sub(r"/+", "/", path).rstrip("/") == "/batch"
+
+async def _dispatch(request: Request, method: str, path: str, payload) -> dict:
+    """Run one sub-call through the app in-process and return {status, body}."""
+    # Checked again here since "$N.field" substitution can rewrite the path
+    if _is_batch_path(path):
+        return {"status": 400, "body": {"detail": "Batches cannot be nested"}}
+    path, _, query = path.partition("?")
+    body = orjson.dumps(payload) if payload is not None else b""
+    scope = {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": "1.1",
+        "method": method.upper(),
+        "scheme": request.url.scheme,
+        "path": unquote(path),
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        "client": request.scope.get("client"),
+        "server": request.scope.get("server"),
+    }
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # Nothing more to read; block like an idle client until the response is done
+        await asyncio.Event().wait()
+
+    status = 500
+    chunks = []
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await request.app(scope, receive, send)
+    except Exception:
+        logger.exception("Batch call %s %s failed", method, path)
+    raw = b"".join(chunks)
+    try:
+        body = orjson.loads(raw) if raw else None
+    except orjson.JSONDecodeError:
+        # Not a JSON endpoint (e.g. /docs): pass the body on as text
+        body = raw.decode("utf-8", "replace")
+    return {"status": status, "body": body}
+
+@app.post("/batch")
+async def batch(calls: List[BatchCall], request: Request):
+    """Run several API calls in one request.
+
+    Each call may depend on earlier ones, via input_from, {"$ref": "N.field"}
+    objects in its payload or "$N.field" segments in its path. Calls run in
+    dependency layers, and calls within a layer run concurrently. A call whose
+    dependency failed is skipped with status 424.
+    """
+    if len(calls) > MAX_BATCH_CALLS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_CALLS} calls per batch")
+
+    deps = []
+    for i, call in enumerate(calls):
+        if _is_batch_path(call.path):
+            raise HTTPException(status_code=400, detail=f"Call {i}: batches cannot be nested")
+        needs = _path_refs(call.path) | _batch_refs(call.payload)
+        if call.input_from >= 0:
+            needs.add(call.input_from)
+        if any(j >= i for j in needs):
+            raise HTTPException(status_code=400, detail=f"Call {i} can only depend on earlier calls")
+        deps.append(needs)
+
+    # Calls are ordered, so one pass assigns each call the layer after its deepest dependency
+    depth = []
+    for needs in deps:
+        depth.append(1 + max((depth[j] for j in needs), default=-1))
+    layers = [[] for _ in range(max(depth, default=-1) + 1)]
+    for i, d in enumerate(depth):
+        layers[d].append(i)
+
+    results = [None] * len(calls)
+
+    async def run(i):
+        call = calls[i]
+        if any(results[j]["status"] >= 400 for j in deps[i]):
+            results[i] = {"status": 424, "body": {"detail": "A call this one depends on failed"}}
+            return
+        try:
+            path = _substitute_path(call.path, results)
+            payload = _batch_substitute(call.payload, results)
+        except (KeyError, IndexError, TypeError):
+            results[i] = {"status": 424, "body": {"detail": "Referenced field missing from an earlier result"}}
+            return
+        results[i] = await _dispatch(request, call.method, path, payload)
+
+    for layer in layers:
+        await asyncio.gather(*(run(i) for i in layer))
+    return results
@@ -1,10 +1,8 @@
-from __future__ import annotations
-
 from datetime import datetime
 from enum import Enum
 from typing import Any, Optional
 
-from sqlalchemy import Column
+from sqlalchemy import Column, func
 from sqlalchemy import Enum as SAEnum
 from sqlmodel import Field, Relationship, SQLModel
 
@@ -24,13 +22,24 @@ class RunStatus(str, Enum):
     FAILED = "failed"
 
 
+# Relationships never lazy-load: touching one that wasn't eager-loaded with
+# selectinload()/joinedload() raises instead of issuing a SELECT per row.
+NO_LAZY_LOAD = {"lazy": "raise_on_sql"}
+
+# Creation timestamps are stamped by SQLite inside the INSERT itself (UTC,
+# millisecond precision) rather than built in Python for every row. Models
+# using it set eager_defaults so the value comes back via RETURNING.
+UTC_NOW = func.strftime("%Y-%m-%d %H:%M:%f", "now")
+
+
 class User(SQLModel, table=True):
     """A user/owner of projects in the blackbox."""
     __tablename__ = "user"  # type: ignore
+    __mapper_args__ = {"eager_defaults": True}
     
     id: Optional[int] = Field(default=None, primary_key=True)
-    username: str = Field(index=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    username: str = Field(index=True, unique=True)
+    created_at: datetime = Field(default=None, sa_column_kwargs={"default": UTC_NOW})
 
 
 class Project(SQLModel, table=True):
@@ -42,28 +51,36 @@ class Project(SQLModel, table=True):
     description: Optional[str] = None
     owner_id: Optional[int] = Field(default=None, foreign_key="user.id", index=True)
 
+    owner: Optional["User"] = Relationship(sa_relationship_kwargs=NO_LAZY_LOAD)
+
 
 class Session(SQLModel, table=True):
     """A session represents a continuous set of runs (e.g. one user session).
     Sessions belong to a project."""
     __tablename__ = "session"  # type: ignore
+    __mapper_args__ = {"eager_defaults": True}
     
     id: Optional[int] = Field(default=None, primary_key=True)
     project_id: Optional[int] = Field(default=None, foreign_key="project.id", index=True)
-    started_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    started_at: datetime = Field(default=None, index=True, sa_column_kwargs={"default": UTC_NOW})
     ended_at: Optional[datetime] = None
 
+    project: Optional["Project"] = Relationship(sa_relationship_kwargs=NO_LAZY_LOAD)
+
 
 class CodeSnippet(SQLModel, table=True):
     """Stores a piece of user code or file that can be executed or analyzed."""
     __tablename__ = "codesnippet"  # type: ignore
+    __mapper_args__ = {"eager_defaults": True}
     
     id: Optional[int] = Field(default=None, primary_key=True)
     project_id: Optional[int] = Field(default=None, foreign_key="project.id", index=True)
     filename: Optional[str] = None
     language: Optional[str] = Field(default="python", index=True)
     code: str
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default=None, sa_column_kwargs={"default": UTC_NOW})
+
+    project: Optional["Project"] = Relationship(sa_relationship_kwargs=NO_LAZY_LOAD)
 
 
 class Run(SQLModel, table=True):
@@ -81,11 +98,16 @@ class Run(SQLModel, table=True):
     stderr: Optional[str] = None
     return_value: Optional[str] = None
 
+    session: Optional["Session"] = Relationship(sa_relationship_kwargs=NO_LAZY_LOAD)
+    snippet: Optional["CodeSnippet"] = Relationship(sa_relationship_kwargs=NO_LAZY_LOAD)
+
 
 class Event(SQLModel, table=True):
     """Generic event/log entry connected to a project and optionally a run."""
+    __mapper_args__ = {"eager_defaults": True}
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    timestamp: datetime = Field(default_factory=datetime.utcnow, index=True)
+    timestamp: datetime = Field(default=None, index=True, sa_column_kwargs={"default": UTC_NOW})
     project_id: Optional[int] = Field(default=None, foreign_key="project.id", index=True)
     run_id: Optional[int] = Field(default=None, foreign_key="run.id", index=True)
 
@@ -93,6 +115,9 @@ class Event(SQLModel, table=True):
     message: Optional[str] = None
     metadata_json: Optional[str] = None  # JSON string or freeform metadata
 
+    project: Optional["Project"] = Relationship(sa_relationship_kwargs=NO_LAZY_LOAD)
+    run: Optional["Run"] = Relationship(sa_relationship_kwargs=NO_LAZY_LOAD)
+
 
 __all__ = [
     "User",
@@ -5,8 +5,13 @@ Verifies installation and configuration
 """
 import sys
 import os
-from pathlib import Path
+import io
+import threading
 import subprocess
+from importlib.metadata import distributions
+from concurrent.futures import ThreadPoolExecutor
+
+from blackbox import PROJECT_ROOT
 
 def print_header(text):
     """Print a formatted header"""
@@ -53,18 +58,26 @@ def check_dependencies():
         'sqlmodel': 'SQL ORM',
         'requests': 'HTTP client',
         'pydantic': 'Data validation',
-        'dotenv': 'Environment config (optional)'
+        'orjson': 'Fast JSON responses',
+        'python-dotenv': 'Environment config (optional)'
     }
     
+    # Read installed distribution names from package metadata instead of
+    # importing each package, which would run its whole import chain
+    installed = set()
+    for dist in distributions():
+        name = dist.metadata['Name']
+        if name:
+            installed.add(name.lower().replace('_', '-').replace('.', '-'))
+    
     missing = []
     
     for package, description in required.items():
-        try:
-            __import__(package.replace('-', '_'))
+        if package in installed:
             print(f"✅ {package:20} - {description}")
-        except ImportError:
+        else:
             print(f"❌ {package:20} - {description} [MISSING]")
-            missing.append(package if package != 'dotenv' else 'python-dotenv')
+            missing.append(package)
     
     if missing:
         print(f"\n❌ Missing {len(missing)} package(s)")
@@ -90,11 +103,9 @@ def check_project_structure():
     }
     
     missing = []
-    # Project root is parent of blackbox package
-    project_root = Path(__file__).parent.parent
     
     for file_path, description in required_files.items():
-        full_path = project_root / file_path
+        full_path = PROJECT_ROOT / file_path
         if full_path.exists():
             print(f"✅ {file_path:30} - {description}")
         else:
@@ -112,10 +123,8 @@ def check_config():
     """Check configuration"""
     print_header("Checking Configuration")
     
-    # Project root is parent of blackbox package
-    project_root = Path(__file__).parent.parent
-    env_file = project_root / '.env'
-    env_example = project_root / '.env.example'
+    env_file = PROJECT_ROOT / '.env'
+    env_example = PROJECT_ROOT / '.env.example'
     
     if env_file.exists():
         print(f"✅ .env file exists")
@@ -129,7 +138,7 @@ def check_config():
         print(f"   Using built-in defaults")
     
     try:
-        sys.path.insert(0, str(project_root))
+        sys.path.insert(0, str(PROJECT_ROOT))
         from config import DATABASE_URL, API_PORT, BLACKBOX_API_URL
         print(f"\n📋 Current Configuration:")
         print(f"   API Port: {API_PORT}")
@@ -144,9 +153,7 @@ def check_database():
     """Check database"""
     print_header("Checking Database")
     
-    # Project root is parent of blackbox package
-    project_root = Path(__file__).parent.parent
-    db_file = project_root / 'devbox.db'
+    db_file = PROJECT_ROOT / 'devbox.db'
     
     if db_file.exists():
         size = db_file.stat().st_size
@@ -163,9 +170,7 @@ def check_git_hooks():
     """Check git hooks installation"""
     print_header("Checking Git Hooks")
     
-    # Look for .git in the project root (parent of blackbox package)
-    project_root = Path(__file__).parent.parent
-    git_dir = project_root / '.git'
+    git_dir = PROJECT_ROOT / '.git'
     git_hooks = git_dir / 'hooks'
     
     if not git_dir.exists():
@@ -214,6 +219,37 @@ def check_api_server():
     print("   Start with: python start_server.py")
     return False
 
+class ThreadOutput(io.TextIOBase):
+    """sys.stdout replacement that gives each capturing thread its own buffer"""
+    
+    def __init__(self, fallback):
+        self.fallback = fallback
+        self._local = threading.local()
+    
+    def write(self, text):
+        buffer = getattr(self._local, "buffer", None)
+        return (buffer or self.fallback).write(text)
+    
+    def flush(self):
+        self.fallback.flush()
+    
+    def capture(self, func, *args):
+        """Call func, returning (everything it printed, its return value)"""
+        self._local.buffer = io.StringIO()
+        try:
+            result = func(*args)
+            return self._local.buffer.getvalue(), result
+        finally:
+            self._local.buffer = None
+
+def run_check(check):
+    """Run a single check, treating an exception as a failed check"""
+    try:
+        return check()
+    except Exception as e:
+        print(f"❌ Check failed with error: {e}")
+        return False
+
 def main():
     """Run all checks"""
     print("\n" + "🔍 Blackbox Project Health Check".center(60))
@@ -229,14 +265,21 @@ def main():
         check_api_server
     ]
     
+    # The checks are independent, so run them side by side (the API probe
+    # alone can wait 2s) and print each one's buffered output in order
+    output = ThreadOutput(sys.stdout)
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            futures = [executor.submit(output.capture, run_check, check) for check in checks]
+            captured = [future.result() for future in futures]
+    finally:
+        sys.stdout = output.fallback
+    
     results = []
-    for check in checks:
-        try:
-            result = check()
-            results.append(result)
-        except Exception as e:
-            print(f"❌ Check failed with error: {e}")
-            results.append(False)
+    for text, result in captured:
+        print(text, end="")
+        results.append(result)
     
     # Summary
     print_header("Summary")
@@ -4,44 +4,127 @@ DevLog CLI - Blackbox development logging tool
 Interact with the Dev Blackbox API to track projects, sessions, code runs, and events.
 """
 import argparse
+import os
 import sys
 import json
+from collections import OrderedDict
 from datetime import datetime
 from typing import Optional
 from pathlib import Path
+from urllib.parse import quote
 
+# orjson is much faster than the stdlib json module; fall back if it's missing
 try:
-    import requests
+    import orjson
 except ImportError:
-    print("Error: 'requests' module not found. Install it with: pip install requests", file=sys.stderr)
-    sys.exit(1)
+    orjson = None
 
 # Try to load configuration
 try:
-    # When installed as package, config should be in project root
-    import os
-    sys.path.insert(0, os.getcwd())
     from config import BLACKBOX_API_URL
     API_BASE = BLACKBOX_API_URL
 except ImportError:
-    API_BASE = "http://127.0.0.1:8000"
+    # When installed as package, config should be in project root
+    sys.path.insert(0, os.getcwd())
+    try:
+        from config import BLACKBOX_API_URL
+        API_BASE = BLACKBOX_API_URL
+    except ImportError:
+        API_BASE = "http://127.0.0.1:8000"
+
+# Name -> id lookups for git hooks, kept between invocations
+CACHE_FILE = Path.home() / ".blackbox" / "cache.json"
+
+
+# Event types the API accepts
+EVENT_TYPES = ["info", "warning", "error", "run", "metric"]
+
+
+# Most GET results a client keeps before dropping the least recently used
+GET_CACHE_SIZE = 256
+
+
+def _resource_family(endpoint: str) -> str:
+    """The first path segment: "/users/by-name/bob" -> "users"."""
+    return endpoint.lstrip("/").split("/", 1)[0].split("?", 1)[0]
+
+
+def _dumps(data) -> bytes:
+    """Encode data as compact JSON bytes."""
+    if orjson:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def _loads(raw: bytes):
+    """Decode JSON bytes."""
+    if orjson:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
 
 class BlackboxClient:
     """Client for interacting with the Dev Blackbox API."""
     
     def __init__(self, base_url: str = API_BASE):
+        # Imported here rather than at module level: requests is the slowest
+        # import in the CLI and isn't needed until a command talks to the API
+        try:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+        except ImportError:
+            print("Error: 'requests' module not found. Install it with: pip install requests", file=sys.stderr)
+            sys.exit(1)
+        
         self.base_url = base_url.rstrip('/')
         self.session = requests.Session()
-        self.session.headers.update({"Content-Type": "application/json"})
+        self.session.headers.update({"Content-Type": "application/json", "Connection": "keep-alive"})
+        # Reuse connections across bursts of calls; retry idempotent requests
+        # on connection errors and gateway/unavailable responses
+        retry = Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504], raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # GET results by (endpoint, params), least recently used first
+        self._get_cache = OrderedDict()
+    
+    def invalidate(self, endpoint: Optional[str] = None):
+        """Forget cached GET results.
+        
+        With an endpoint, only its resource family (e.g. everything under
+        /users for POST /users) and the stats are dropped; otherwise all.
+        """
+        family = _resource_family(endpoint) if endpoint else None
+        if family in (None, "batch"):  # a batch can write to anything
+            self._get_cache.clear()
+            return
+        for key in [k for k in self._get_cache if _resource_family(k[0]) in (family, "stats")]:
+            del self._get_cache[key]
     
     def _request(self, method: str, endpoint: str, **kwargs):
-        """Make an HTTP request and handle errors."""
+        """Make an HTTP request and handle errors.
+        
+        GET results are cached for the life of the client; any other method
+        invalidates the cached results it could have changed.
+        """
+        import requests  # already loaded by __init__
+        if method == "GET":
+            key = (endpoint, tuple(sorted((kwargs.get("params") or {}).items())))
+            if key in self._get_cache:
+                self._get_cache.move_to_end(key)
+                return self._get_cache[key]
+        else:
+            self.invalidate(endpoint)
+        
         url = f"{self.base_url}{endpoint}"
+        if "json" in kwargs:
+            # Encode the body ourselves; the session already sends the JSON content type
+            kwargs["data"] = _dumps(kwargs.pop("json"))
         try:
             response = self.session.request(method, url, timeout=10, **kwargs)
             response.raise_for_status()
-            return response.json()
+            result = _loads(response.content)
         except requests.exceptions.ConnectionError:
             print(f"❌ Cannot connect to API at {self.base_url}", file=sys.stderr)
             print("   Make sure the server is running: python -m uvicorn backend.main:app", file=sys.stderr)
@@ -54,6 +137,12 @@ class BlackboxClient:
         except requests.exceptions.Timeout:
             print(f"❌ Request timeout to {url}", file=sys.stderr)
             sys.exit(1)
+        
+        if method == "GET":
+            self._get_cache[key] = result
+            if len(self._get_cache) > GET_CACHE_SIZE:
+                self._get_cache.popitem(last=False)
+        return result
     
     # ===================== User operations =====================
     
@@ -61,14 +150,18 @@ class BlackboxClient:
         """Create a new user."""
         return self._request("POST", "/users", json={"username": username})
     
-    def list_users(self):
-        """List all users."""
-        return self._request("GET", "/users")
+    def list_users(self, limit: Optional[int] = None, after_id: Optional[int] = None):
+        """List users (one page; pass the last id as after_id for the next)."""
+        return self._request("GET", "/users", params=_page_params({}, limit, after_id))
     
     def get_user(self, user_id: int):
         """Get user by ID."""
         return self._request("GET", f"/users/{user_id}")
     
+    def get_user_by_name(self, username: str):
+        """Get user by username."""
+        return self._request("GET", f"/users/by-name/{quote(username, safe='')}")
+    
     # ===================== Project operations =====================
     
     def create_project(self, name: str, description: Optional[str] = None, owner_id: Optional[int] = None):
@@ -80,24 +173,28 @@ class BlackboxClient:
             payload["owner_id"] = owner_id
         return self._request("POST", "/projects", json=payload)
     
-    def list_projects(self):
-        """List all projects."""
-        return self._request("GET", "/projects")
+    def list_projects(self, limit: Optional[int] = None, after_id: Optional[int] = None):
+        """List projects (one page; pass the last id as after_id for the next)."""
+        return self._request("GET", "/projects", params=_page_params({}, limit, after_id))
     
     def get_project(self, project_id: int):
         """Get project by ID."""
         return self._request("GET", f"/projects/{project_id}")
     
+    def get_project_by_name(self, name: str):
+        """Get project by name."""
+        return self._request("GET", f"/projects/by-name/{quote(name, safe='')}")
+    
     # ===================== Session operations =====================
     
     def create_session(self, project_id: int):
         """Start a new session for a project."""
         return self._request("POST", "/sessions", json={"project_id": project_id})
     
-    def list_sessions(self, project_id: Optional[int] = None):
+    def list_sessions(self, project_id: Optional[int] = None, limit: Optional[int] = None, after_id: Optional[int] = None):
         """List sessions, optionally filtered by project."""
         params = {"project_id": project_id} if project_id else {}
-        return self._request("GET", "/sessions", params=params)
+        return self._request("GET", "/sessions", params=_page_params(params, limit, after_id))
     
     def get_session(self, session_id: int):
         """Get session by ID."""
@@ -120,14 +217,15 @@ class BlackboxClient:
             payload["filename"] = filename
         return self._request("POST", "/snippets", json=payload)
     
-    def list_snippets(self, project_id: Optional[int] = None, language: Optional[str] = None):
-        """List snippets."""
+    def list_snippets(self, project_id: Optional[int] = None, language: Optional[str] = None,
+                      limit: Optional[int] = None, after_id: Optional[int] = None, summary: bool = False):
+        """List snippets (summary=True leaves out the code)."""
         params = {}
         if project_id:
             params["project_id"] = project_id
         if language:
             params["language"] = language
-        return self._request("GET", "/snippets", params=params)
+        return self._request("GET", "/snippets", params=_page_params(params, limit, after_id, summary))
     
     def get_snippet(self, snippet_id: int):
         """Get snippet by ID."""
@@ -142,14 +240,15 @@ class BlackboxClient:
             payload["snippet_id"] = snippet_id
         return self._request("POST", "/runs", json=payload)
     
-    def list_runs(self, session_id: Optional[int] = None, status: Optional[str] = None):
-        """List runs."""
+    def list_runs(self, session_id: Optional[int] = None, status: Optional[str] = None,
+                  limit: Optional[int] = None, after_id: Optional[int] = None, summary: bool = False):
+        """List runs (summary=True leaves out stdout/stderr)."""
         params = {}
         if session_id:
             params["session_id"] = session_id
         if status:
             params["status"] = status
-        return self._request("GET", "/runs", params=params)
+        return self._request("GET", "/runs", params=_page_params(params, limit, after_id, summary))
     
     def get_run(self, run_id: int):
         """Get run by ID."""
@@ -174,21 +273,17 @@ class BlackboxClient:
     def create_event(self, project_id: int, event_type: str, message: Optional[str] = None, 
                      run_id: Optional[int] = None, metadata: Optional[str] = None):
         """Create a new event."""
-        payload = {
-            "project_id": project_id,
-            "event_type": event_type
-        }
-        if message:
-            payload["message"] = message
-        if run_id:
-            payload["run_id"] = run_id
-        if metadata:
-            payload["metadata_json"] = metadata
+        payload = _event_payload(project_id, event_type, message, run_id, metadata)
         return self._request("POST", "/events", json=payload)
-    
+
+    def create_events(self, events: list):
+        """Create many events in one request (payloads as for create_event)."""
+        return self._request("POST", "/events/bulk", json=events)
+
     def list_events(self, project_id: Optional[int] = None, run_id: Optional[int] = None, 
-                    event_type: Optional[str] = None):
-        """List events."""
+                    event_type: Optional[str] = None, limit: Optional[int] = None, after_id: Optional[int] = None,
+                    summary: bool = False):
+        """List events (summary=True leaves out the metadata)."""
         params = {}
         if project_id:
             params["project_id"] = project_id
@@ -196,12 +291,24 @@ class BlackboxClient:
             params["run_id"] = run_id
         if event_type:
             params["event_type"] = event_type
-        return self._request("GET", "/events", params=params)
+        return self._request("GET", "/events", params=_page_params(params, limit, after_id, summary))
     
     def get_event(self, event_id: int):
         """Get event by ID."""
         return self._request("GET", f"/events/{event_id}")
     
+    # ===================== Batch operations =====================
+    
+    def batch(self, calls: list):
+        """Run several API calls in one request.
+        
+        Each call is {"method", "path", "payload", "input_from"}; a later call
+        can use {"$ref": "N.field"} in its payload, or a "$N.field" path
+        segment, to refer to a field of call N's result.
+        Returns a list of {"status", "body"}, one per call.
+        """
+        return self._request("POST", "/batch", json=calls)
+    
     # ===================== Stats operations =====================
     
     def get_stats(self):
@@ -209,12 +316,376 @@ class BlackboxClient:
         return self._request("GET", "/stats/summary")
 
 
+def _page_params(params: dict, limit: Optional[int] = None, after_id: Optional[int] = None,
+                 summary: bool = False) -> dict:
+    """Add paging options to a list request's query parameters."""
+    if limit:
+        params["limit"] = limit
+    if after_id:
+        params["after_id"] = after_id
+    if summary:
+        params["summary"] = "true"
+    return params
+
+
+def _event_payload(project_id, event_type: str, message: Optional[str] = None,
+                   run_id: Optional[int] = None, metadata: Optional[str] = None):
+    """Build the POST /events body, omitting empty fields."""
+    payload = {
+        "project_id": project_id,
+        "event_type": event_type
+    }
+    if message:
+        payload["message"] = message
+    if run_id:
+        payload["run_id"] = run_id
+    if metadata:
+        payload["metadata_json"] = metadata
+    return payload
+
+
+def _load_cache() -> dict:
+    try:
+        return json.loads(CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _cache_update(updates: dict):
+    """Store several values in the cache at once (None removes a key)."""
+    cache = _load_cache()
+    for key, value in updates.items():
+        if value is None:
+            cache.pop(key, None)
+        else:
+            cache[key] = value
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = CACHE_FILE.with_name(f"{CACHE_FILE.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(cache))
+        os.replace(tmp, CACHE_FILE)  # atomic, so concurrent hooks never see a partial file
+    except OSError:
+        pass
+
+
+def commit_event(project: str, message: str, commit_hash: Optional[str] = None,
+                 git_user: Optional[str] = None) -> dict:
+    """Build the hook event for a git commit (the auto-commit command)."""
+    git_user = git_user or "unknown"
+    metadata = {}
+    if commit_hash:
+        metadata['commit_hash'] = commit_hash
+    if git_user:
+        metadata['git_user'] = git_user
+    
+    return {"git_user": git_user, "project": project, "event_type": "info",
+            "message": f"Commit: {message}", "metadata": json.dumps(metadata) if metadata else None}
+
+
+def hook_event(project: str, event_type: str, message: str, git_user: Optional[str] = None) -> dict:
+    """Build a generic hook event (the auto-event command)."""
+    # Checked up front: log_hook_events stores events in bulk, and one the
+    # API rejects would take the rest of its bulk call down with it
+    if event_type not in EVENT_TYPES:
+        raise ValueError(f"Unknown event type: {event_type}")
+    git_user = git_user or "unknown"
+    metadata = {}
+    if git_user:
+        metadata['git_user'] = git_user
+    
+    return {"git_user": git_user, "project": project, "event_type": event_type,
+            "message": message, "metadata": json.dumps(metadata) if metadata else None}
+
+
+def log_hook_events(client: BlackboxClient, events: list):
+    """Log hook events, auto-creating their users and projects if needed.
+    
+    events are dicts from commit_event()/hook_event(). They are stored with
+    one POST /events/bulk, so their ids follow the order they were given in.
+    The (user, project) ids are cached on disk; when every pair is known that
+    is the only call. Otherwise one batch looks up the unknown users and
+    projects by name first, and whatever is missing is created in the same
+    batch as the bulk call. If that fails, because a cached project is gone
+    (e.g. the database was reset) or a concurrent hook created the same user
+    first, the cached pairs are dropped and the events sent again.
+    """
+    def key(e):
+        return f"{client.base_url}|{e['git_user']}|{e['project']}"
+    
+    cache = _load_cache()
+    known = {key(e): cache[key(e)] for e in events if key(e) in cache}
+    updates = {}
+    
+    try:
+        resolved = _send_hook_events(client, events, known, key)
+        if resolved is None:
+            # Forget the cached pairs and resolve everything again; the lookups
+            # also find a user or project another hook created since ours, whose
+            # creation then failed (400) and took our bulk call down with it (424)
+            updates.update(dict.fromkeys(known))
+            resolved = _send_hook_events(client, events, {}, key)
+        updates.update(resolved or {})
+    except:
+        pass
+    finally:
+        if updates:
+            _cache_update(updates)
+
+
+def _send_hook_events(client: BlackboxClient, events: list, known: dict, key) -> Optional[dict]:
+    """Store events with one bulk call, resolving the pairs not in known first.
+    
+    known maps key(e) to cached {"user_id", "project_id"}. Returns the ids of
+    the pairs resolved here, or None if the events were not stored.
+    """
+    misses = [e for e in events if key(e) not in known]
+    # name -> id, or {"$ref": "N.id"} for one created earlier in the batch
+    user_ids = {}
+    project_ids = {}
+    if misses:
+        usernames = list(dict.fromkeys(e["git_user"] for e in misses))
+        project_names = list(dict.fromkeys(e["project"] for e in misses))
+        lookups = client.batch(
+            [{"path": f"/users/by-name/{quote(name, safe='')}"} for name in usernames]
+            + [{"path": f"/projects/by-name/{quote(name, safe='')}"} for name in project_names]
+        )
+        user_ids = {
+            name: r["body"]["id"] for name, r in zip(usernames, lookups) if r["status"] < 400
+        }
+        project_ids = {
+            name: r["body"]["id"] for name, r in zip(project_names, lookups[len(usernames):]) if r["status"] < 400
+        }
+    
+    calls = []
+    for e in misses:
+        # Auto-create user if needed
+        if e["git_user"] not in user_ids:
+            calls.append({"method": "POST", "path": "/users", "payload": {"username": e["git_user"]}})
+            user_ids[e["git_user"]] = {"$ref": f"{len(calls) - 1}.id"}
+        
+        # Auto-create project if needed
+        if e["project"] not in project_ids:
+            calls.append({"method": "POST", "path": "/projects", "payload": {
+                "name": e["project"],
+                "description": f"Auto-created for {e['git_user']}",
+                "owner_id": user_ids[e["git_user"]]
+            }})
+            project_ids[e["project"]] = {"$ref": f"{len(calls) - 1}.id"}
+    
+    payload = []
+    for e in events:
+        project_id = known[key(e)]["project_id"] if key(e) in known else project_ids[e["project"]]
+        payload.append(_event_payload(project_id, e["event_type"], e["message"], metadata=e["metadata"]))
+    calls.append({"method": "POST", "path": "/events/bulk", "payload": payload})
+    results = client.batch(calls)
+    if results[-1]["status"] >= 400:
+        return None
+    
+    def resolve(ref):
+        if isinstance(ref, dict):
+            return results[int(ref["$ref"].split(".")[0])]["body"]["id"]
+        return ref
+    
+    return {
+        key(e): {"user_id": resolve(user_ids[e["git_user"]]), "project_id": resolve(project_ids[e["project"]])}
+        for e in misses
+    }
+
+
+# ===================== Daemon =====================
+
+# The daemon's worker sends queued events in batches of up to DAEMON_BATCH_SIZE,
+# waiting at most DAEMON_BATCH_WAIT seconds for a batch to fill up
+DAEMON_BATCH_SIZE = 32
+DAEMON_BATCH_WAIT = 0.05
+
+
+def default_socket_path() -> str:
+    """Where the daemon listens, and where the git hooks look for it."""
+    if os.environ.get("BLACKBOX_SOCKET"):
+        return os.environ["BLACKBOX_SOCKET"]
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        return os.path.join(os.environ["XDG_RUNTIME_DIR"], "blackbox.sock")
+    return f"/tmp/blackbox-{os.getuid()}.sock"
+
+
+def parse_daemon_request(request: dict) -> dict:
+    """Turn a daemon request, {"command": "auto-commit" | "auto-event", ...}, into a hook event.
+    
+    The other fields are the command's options, named as on the command line
+    (project, message, commit_hash, type, git_user).
+    """
+    command = request.get("command")
+    if command == "auto-commit":
+        return commit_event(request["project"], request["message"],
+                            request.get("commit_hash"), request.get("git_user"))
+    if command == "auto-event":
+        return hook_event(request["project"], request["type"], request["message"],
+                          request.get("git_user"))
+    raise ValueError(f"Unknown command: {command}")
+
+
+def _next_batch(events, stop) -> list:
+    """Wait for queued events and take up to DAEMON_BATCH_SIZE of them.
+    
+    After the first event arrives, keep collecting for DAEMON_BATCH_WAIT
+    seconds so a burst of hooks (a rebase, a scripted loop) shares one batch.
+    """
+    import queue
+    import time
+    
+    batch = [events.get()]
+    deadline = time.monotonic() + DAEMON_BATCH_WAIT
+    while len(batch) < DAEMON_BATCH_SIZE and batch[-1] is not stop:
+        timeout = deadline - time.monotonic()
+        if timeout <= 0:
+            break
+        try:
+            batch.append(events.get(timeout=timeout))
+        except queue.Empty:
+            break
+    return batch
+
+
+def run_daemon(client: BlackboxClient, socket_path: str):
+    """Serve hook requests on a Unix socket until interrupted.
+    
+    Each connection sends one JSON request line and gets back one JSON line,
+    {"ok": true} or {"ok": false, "error": ...}. Requests are answered as
+    soon as they are queued; a worker thread sends the queued events to the
+    API in batches, over the daemon's one pooled session. Git hooks talk to
+    it with `nc -U`, so they skip starting Python entirely.
+    """
+    import queue
+    import signal
+    import socket
+    import socketserver
+    import threading
+    
+    if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+        print("❌ The daemon needs Unix domain sockets, which this platform lacks", file=sys.stderr)
+        sys.exit(1)
+    
+    if os.path.lexists(socket_path):
+        # In a shared directory like /tmp the path may belong to another user:
+        # leave it alone rather than unlinking or serving behind it
+        if os.lstat(socket_path).st_uid != os.getuid():
+            print(f"❌ {socket_path} belongs to another user; set BLACKBOX_SOCKET to use another path",
+                  file=sys.stderr)
+            sys.exit(1)
+        probe = socket.socket(socket.AF_UNIX)
+        try:
+            probe.connect(socket_path)
+        except OSError:
+            os.unlink(socket_path)  # left behind by a daemon that didn't shut down cleanly
+        else:
+            print(f"❌ A daemon is already listening on {socket_path}", file=sys.stderr)
+            sys.exit(1)
+        finally:
+            probe.close()
+    
+    events = queue.Queue()
+    stop = object()
+    
+    def worker():
+        while True:
+            batch = _next_batch(events, stop)
+            pending = [e for e in batch if e is not stop]
+            if pending:
+                log_hook_events(client, pending)
+            if len(pending) < len(batch):
+                return
+    
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            line = self.rfile.readline()
+            if not line.strip():
+                return  # e.g. another daemon checking whether this one is alive
+            try:
+                events.put(parse_daemon_request(_loads(line)))
+                reply = {"ok": True}
+            except Exception as e:
+                reply = {"ok": False, "error": str(e) or type(e).__name__}
+            self.wfile.write(_dumps(reply) + b"\n")
+    
+    old_umask = os.umask(0o077)  # only this user may connect
+    try:
+        server = socketserver.ThreadingUnixStreamServer(socket_path, Handler)
+    finally:
+        os.umask(old_umask)
+    server.daemon_threads = True
+    # Exit through the finally below on `kill` too, so the socket file is removed
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    
+    sender = threading.Thread(target=worker, daemon=True)
+    sender.start()
+    
+    print(f"🛰️  Blackbox daemon listening on {socket_path} (API: {client.base_url})")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        os.unlink(socket_path)
+        # Send whatever is still queued before exiting
+        events.put(stop)
+        sender.join(timeout=10)
+
+
 def print_json(data):
     """Pretty-print JSON data."""
-    print(json.dumps(data, indent=2, default=str))
+    if orjson:
+        print(orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2).decode())
+    else:
+        print(json.dumps(data, indent=2, default=str))
+
+
+def _add_page_args(parser: argparse.ArgumentParser, summary: Optional[str] = None):
+    """Add paging options to a list command (and --summary, described by summary)."""
+    parser.add_argument("--limit", type=int, help="Maximum number of results (API default: 100)")
+    parser.add_argument("--after-id", type=int, help="Only results after this ID (for the next page)")
+    if summary:
+        parser.add_argument("--summary", action="store_true", help=f"Summary rows only: {summary}")
+
+
+def _add_auto_commit_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--project", required=True, help="Project name")
+    parser.add_argument("--message", required=True, help="Commit message")
+    parser.add_argument("--commit-hash", help="Commit hash")
+    parser.add_argument("--git-user", help="Git username")
+
+
+def _add_auto_event_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--project", required=True, help="Project name")
+    parser.add_argument("--type", required=True, choices=EVENT_TYPES, help="Event type")
+    parser.add_argument("--message", required=True, help="Event message")
+    parser.add_argument("--git-user", help="Git username")
+
+
+# Commands the git hooks run, with the function that adds their options
+HOOK_COMMANDS = {
+    "auto-commit": _add_auto_commit_args,
+    "auto-event": _add_auto_event_args,
+}
+
+
+def _hook_event_from_args(args) -> dict:
+    if args.command == "auto-commit":
+        return commit_event(args.project, args.message, args.commit_hash, args.git_user)
+    return hook_event(args.project, args.type, args.message, args.git_user)
 
 
 def main():
+    # Git hooks run on every commit and checkout and only ever use the auto-*
+    # commands: parse those with a parser for just that command rather than
+    # building the whole command tree below
+    if len(sys.argv) > 1 and sys.argv[1] in HOOK_COMMANDS:
+        command = sys.argv[1]
+        hook_parser = argparse.ArgumentParser(prog=f"{Path(sys.argv[0]).name} {command}")
+        HOOK_COMMANDS[command](hook_parser)
+        args = hook_parser.parse_args(sys.argv[2:], argparse.Namespace(command=command))
+        log_hook_events(BlackboxClient(API_BASE), [_hook_event_from_args(args)])
+        return
+    
     parser = argparse.ArgumentParser(
         description="DevLog CLI - Blackbox development logging tool",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -251,7 +722,7 @@ Examples:
     user_create = user_sub.add_parser("create", help="Create a new user")
     user_create.add_argument("username", help="Username")
     
-    user_sub.add_parser("list", help="List all users")
+    _add_page_args(user_sub.add_parser("list", help="List all users"))
     
     user_get = user_sub.add_parser("get", help="Get user by ID")
     user_get.add_argument("id", type=int, help="User ID")
@@ -266,7 +737,7 @@ Examples:
     project_create.add_argument("--desc", help="Project description")
     project_create.add_argument("--owner-id", type=int, help="Owner user ID")
     
-    project_sub.add_parser("list", help="List all projects")
+    _add_page_args(project_sub.add_parser("list", help="List all projects"))
     
     project_get = project_sub.add_parser("get", help="Get project by ID")
     project_get.add_argument("id", type=int, help="Project ID")
@@ -281,6 +752,7 @@ Examples:
     
     session_list = session_sub.add_parser("list", help="List sessions")
     session_list.add_argument("--project-id", type=int, help="Filter by project ID")
+    _add_page_args(session_list)
     
     session_get = session_sub.add_parser("get", help="Get session by ID")
     session_get.add_argument("id", type=int, help="Session ID")
@@ -302,6 +774,7 @@ Examples:
     snippet_list = snippet_sub.add_parser("list", help="List snippets")
     snippet_list.add_argument("--project-id", type=int, help="Filter by project ID")
     snippet_list.add_argument("--lang", help="Filter by language")
+    _add_page_args(snippet_list, summary="leave out the code")
     
     snippet_get = snippet_sub.add_parser("get", help="Get snippet by ID")
     snippet_get.add_argument("id", type=int, help="Snippet ID")
@@ -318,6 +791,7 @@ Examples:
     run_list = run_sub.add_parser("list", help="List runs")
     run_list.add_argument("--session-id", type=int, help="Filter by session ID")
     run_list.add_argument("--status", choices=["pending", "running", "success", "failed"], help="Filter by status")
+    _add_page_args(run_list, summary="leave out stdout/stderr")
     
     run_get = run_sub.add_parser("get", help="Get run by ID")
     run_get.add_argument("id", type=int, help="Run ID")
@@ -346,6 +820,7 @@ Examples:
     event_list.add_argument("--project-id", type=int, help="Filter by project ID")
     event_list.add_argument("--run-id", type=int, help="Filter by run ID")
     event_list.add_argument("--type", choices=["info", "warning", "error", "run", "metric"], help="Filter by event type")
+    _add_page_args(event_list, summary="leave out the metadata")
     
     event_get = event_sub.add_parser("get", help="Get event by ID")
     event_get.add_argument("id", type=int, help="Event ID")
@@ -354,17 +829,11 @@ Examples:
     subparsers.add_parser("stats", help="View summary statistics")
     
     # ===================== Automation commands (for git hooks) =====================
-    auto_commit = subparsers.add_parser("auto-commit", help="Auto-log git commit (used by hooks)")
-    auto_commit.add_argument("--project", required=True, help="Project name")
-    auto_commit.add_argument("--message", required=True, help="Commit message")
-    auto_commit.add_argument("--commit-hash", help="Commit hash")
-    auto_commit.add_argument("--git-user", help="Git username")
-    
-    auto_event = subparsers.add_parser("auto-event", help="Auto-log event (used by hooks)")
-    auto_event.add_argument("--project", required=True, help="Project name")
-    auto_event.add_argument("--type", required=True, help="Event type")
-    auto_event.add_argument("--message", required=True, help="Event message")
-    auto_event.add_argument("--git-user", help="Git username")
+    _add_auto_commit_args(subparsers.add_parser("auto-commit", help="Auto-log git commit (used by hooks)"))
+    _add_auto_event_args(subparsers.add_parser("auto-event", help="Auto-log event (used by hooks)"))
+    
+    daemon = subparsers.add_parser("daemon", help="Serve git hook events over a Unix socket")
+    daemon.add_argument("--socket", help="Socket path (default: $XDG_RUNTIME_DIR/blackbox.sock)")
     
     args = parser.parse_args()
     
@@ -377,7 +846,7 @@ Examples:
                 result = client.create_user(args.username)
                 print(f"✅ User created: ID={result['id']}, username={result['username']}")
             elif args.subcommand == "list":
-                users = client.list_users()
+                users = client.list_users(args.limit, args.after_id)
                 print(f"📋 Found {len(users)} user(s):")
                 print_json(users)
             elif args.subcommand == "get":
@@ -390,7 +859,7 @@ Examples:
                 result = client.create_project(args.name, args.desc, args.owner_id)
                 print(f"✅ Project created: ID={result['id']}, name={result['name']}")
             elif args.subcommand == "list":
-                projects = client.list_projects()
+                projects = client.list_projects(args.limit, args.after_id)
                 print(f"📋 Found {len(projects)} project(s):")
                 print_json(projects)
             elif args.subcommand == "get":
@@ -403,7 +872,7 @@ Examples:
                 result = client.create_session(args.project_id)
                 print(f"✅ Session started: ID={result['id']}, project_id={result['project_id']}")
             elif args.subcommand == "list":
-                sessions = client.list_sessions(args.project_id)
+                sessions = client.list_sessions(args.project_id, args.limit, args.after_id)
                 print(f"📋 Found {len(sessions)} session(s):")
                 print_json(sessions)
             elif args.subcommand == "get":
@@ -419,7 +888,7 @@ Examples:
                 result = client.create_snippet(args.project_id, args.code, args.file, args.lang)
                 print(f"✅ Snippet created: ID={result['id']}, filename={result.get('filename', 'N/A')}")
             elif args.subcommand == "list":
-                snippets = client.list_snippets(args.project_id, args.lang)
+                snippets = client.list_snippets(args.project_id, args.lang, args.limit, args.after_id, args.summary)
                 print(f"📋 Found {len(snippets)} snippet(s):")
                 print_json(snippets)
             elif args.subcommand == "get":
@@ -432,7 +901,7 @@ Examples:
                 result = client.create_run(args.session_id, args.snippet_id)
                 print(f"✅ Run created: ID={result['id']}, status={result['status']}")
             elif args.subcommand == "list":
-                runs = client.list_runs(args.session_id, args.status)
+                runs = client.list_runs(args.session_id, args.status, args.limit, args.after_id, args.summary)
                 print(f"📋 Found {len(runs)} run(s):")
                 print_json(runs)
             elif args.subcommand == "get":
@@ -449,7 +918,8 @@ Examples:
                                             args.run_id, args.metadata)
                 print(f"✅ Event logged: ID={result['id']}, timestamp={result['timestamp']}")
             elif args.subcommand == "list":
-                events = client.list_events(args.project_id, args.run_id, args.type)
+                events = client.list_events(args.project_id, args.run_id, args.type,
+                                           args.limit, args.after_id, args.summary)
                 print(f"📋 Found {len(events)} event(s):")
                 print_json(events)
             elif args.subcommand == "get":
@@ -463,89 +933,11 @@ Examples:
             print_json(stats)
         
         # Automation commands (silent mode for git hooks)
-        elif args.command == "auto-commit":
-            # Auto-create user if needed
-            git_user = args.git_user or "unknown"
-            user_id = None
-            try:
-                users = client.list_users()
-                user = next((u for u in users if u['username'] == git_user), None)
-                if not user:
-                    user = client.create_user(git_user)
-                user_id = user['id']
-            except:
-                pass
-            
-            # Auto-create project if needed
-            project_name = args.project
-            project_id = None
-            try:
-                projects = client.list_projects()
-                project = next((p for p in projects if p['name'] == project_name), None)
-                if not project:
-                    project = client.create_project(project_name, f"Auto-created for {git_user}", user_id)
-                project_id = project['id']
-            except:
-                pass
-            
-            # Log commit event
-            if project_id:
-                metadata = {}
-                if args.commit_hash:
-                    metadata['commit_hash'] = args.commit_hash
-                if git_user:
-                    metadata['git_user'] = git_user
-                
-                try:
-                    client.create_event(
-                        project_id, 
-                        "info",
-                        f"Commit: {args.message}",
-                        metadata=json.dumps(metadata) if metadata else None
-                    )
-                except:
-                    pass
+        elif args.command in HOOK_COMMANDS:
+            log_hook_events(client, [_hook_event_from_args(args)])
         
-        elif args.command == "auto-event":
-            # Auto-create user if needed
-            git_user = args.git_user or "unknown"
-            user_id = None
-            try:
-                users = client.list_users()
-                user = next((u for u in users if u['username'] == git_user), None)
-                if not user:
-                    user = client.create_user(git_user)
-                user_id = user['id']
-            except:
-                pass
-            
-            # Auto-create project if needed
-            project_name = args.project
-            project_id = None
-            try:
-                projects = client.list_projects()
-                project = next((p for p in projects if p['name'] == project_name), None)
-                if not project:
-                    project = client.create_project(project_name, f"Auto-created for {git_user}", user_id)
-                project_id = project['id']
-            except:
-                pass
-            
-            # Log event
-            if project_id:
-                metadata = {}
-                if git_user:
-                    metadata['git_user'] = git_user
-                
-                try:
-                    client.create_event(
-                        project_id,
-                        args.type,
-                        args.message,
-                        metadata=json.dumps(metadata) if metadata else None
-                    )
-                except:
-                    pass
+        elif args.command == "daemon":
+            run_daemon(client, args.socket or default_socket_path())
     
     except KeyboardInterrupt:
         print("\n⚠️  Interrupted by user", file=sys.stderr)
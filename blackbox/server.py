@@ -4,19 +4,21 @@ Blackbox API Server Startup Script
 Run this to start the development server
 """
 import sys
-import uvicorn
 from pathlib import Path
 import os
 
-# Add project root to path
-sys.path.insert(0, os.getcwd())
-
 try:
-    from config import API_HOST, API_PORT, API_RELOAD
+    from config import API_HOST, API_PORT, API_RELOAD, API_WORKERS
 except ImportError:
-    API_HOST = "0.0.0.0"
-    API_PORT = 8000
-    API_RELOAD = True
+    # Not on the path yet: add the project root and try again
+    sys.path.insert(0, os.getcwd())
+    try:
+        from config import API_HOST, API_PORT, API_RELOAD, API_WORKERS
+    except ImportError:
+        API_HOST = "0.0.0.0"
+        API_PORT = 8000
+        API_RELOAD = True
+        API_WORKERS = 1
 
 def main():
     """Main entry point for server"""
@@ -30,11 +32,21 @@ def main():
     print("=" * 60)
     print()
     
+    # uvicorn[standard] brings uvloop and httptools, which the default
+    # loop="auto"/http="auto" pick up. Reload mode only supports one worker.
+    workers = 1 if API_RELOAD else API_WORKERS
+    if workers > 1:
+        # Create the schema once up front so the workers don't race to do it
+        from blackbox.backend.db import init_db
+        init_db()
+    
+    import uvicorn
     uvicorn.run(
         "blackbox.backend.main:app",
         host=API_HOST,
         port=API_PORT,
-        reload=API_RELOAD
+        reload=API_RELOAD,
+        workers=workers
     )
 
 if __name__ == "__main__":
@@ -2,22 +2,62 @@
 Blackbox Configuration Management
 Loads settings from environment variables with sensible defaults
 """
+import json
 import os
 from pathlib import Path
-from dotenv import load_dotenv
+
+# Parsed .env files, keyed by path and stamped with the file's mtime and size,
+# so CLI calls (git hooks) don't import and run python-dotenv every time
+ENV_CACHE_FILE = Path.home() / ".blackbox" / "env.cache"
+
+
+def _load_env(env_path: Path):
+    """Set variables from env_path that aren't already in the environment."""
+    st = env_path.stat()
+    stamp = [st.st_mtime_ns, st.st_size]
+    try:
+        cache = json.loads(ENV_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        cache = {}
+    
+    entry = cache.get(str(env_path))
+    if entry and entry["stamp"] == stamp:
+        values = entry["values"]
+    else:
+        try:
+            from dotenv import dotenv_values
+        except ImportError:
+            return
+        values = {k: v for k, v in dotenv_values(env_path).items() if v is not None}
+        cache[str(env_path)] = {"stamp": stamp, "values": values}
+        try:
+            ENV_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp = ENV_CACHE_FILE.with_name(f"{ENV_CACHE_FILE.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(cache))
+            os.replace(tmp, ENV_CACHE_FILE)
+        except OSError:
+            pass
+    
+    # Like load_dotenv(): the real environment wins over .env
+    for key, value in values.items():
+        os.environ.setdefault(key, value)
+
 
 # Load .env file if it exists
 env_path = Path(__file__).parent / ".env"
 if env_path.exists():
-    load_dotenv(env_path)
+    _load_env(env_path)
 
 # API Configuration
 API_HOST = os.getenv("API_HOST", "0.0.0.0")
 API_PORT = int(os.getenv("API_PORT", "8000"))
 API_RELOAD = os.getenv("API_RELOAD", "true").lower() == "true"
+API_WORKERS = int(os.getenv("API_WORKERS", "1"))
 
 # Database Configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./devbox.db")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "40"))
 
 # CLI Configuration
 BLACKBOX_API_URL = os.getenv("BLACKBOX_API_URL", "http://localhost:8000")
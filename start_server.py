@@ -4,18 +4,20 @@ Blackbox API Server Startup Script
 Run this to start the development server
 """
 import sys
-import uvicorn
 from pathlib import Path
 
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent))
-
 try:
-    from config import API_HOST, API_PORT, API_RELOAD
+    from config import API_HOST, API_PORT, API_RELOAD, API_WORKERS
 except ImportError:
-    API_HOST = "0.0.0.0"
-    API_PORT = 8000
-    API_RELOAD = True
+    # Not on the path yet: add the project root and try again
+    sys.path.insert(0, str(Path(__file__).parent))
+    try:
+        from config import API_HOST, API_PORT, API_RELOAD, API_WORKERS
+    except ImportError:
+        API_HOST = "0.0.0.0"
+        API_PORT = 8000
+        API_RELOAD = True
+        API_WORKERS = 1
 
 if __name__ == "__main__":
     print("=" * 60)
@@ -28,9 +30,19 @@ if __name__ == "__main__":
     print("=" * 60)
     print()
     
+    # uvicorn[standard] brings uvloop and httptools, which the default
+    # loop="auto"/http="auto" pick up. Reload mode only supports one worker.
+    workers = 1 if API_RELOAD else API_WORKERS
+    if workers > 1:
+        # Create the schema once up front so the workers don't race to do it
+        from blackbox.backend.db import init_db
+        init_db()
+    
+    import uvicorn
     uvicorn.run(
-        "backend.main:app",
+        "blackbox.backend.main:app",
         host=API_HOST,
         port=API_PORT,
-        reload=API_RELOAD
+        reload=API_RELOAD,
+        workers=workers
     )
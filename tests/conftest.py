@@ -0,0 +1,55 @@
+# Blackbox test configuration
+
+import http.client
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import pytest
+
+API_URL = "http://localhost:8000"
+
+# Test files that run without the API server
+OFFLINE_TESTS = {"test_cli.py"}
+
+def wait_for_api(max_attempts=15):
+    """Wait for API to be available
+
+    The first probe goes out immediately, then the delay doubles from 20 ms
+    up to 0.5 s, which keeps the whole wait to about 5 seconds. Probes use a
+    bare http.client connection, reused across attempts.
+    """
+    url = urlsplit(API_URL)
+    conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=0.25)
+    delay = 0.02
+    try:
+        for i in range(max_attempts):
+            try:
+                conn.request("GET", "/health")
+                response = conn.getresponse()
+                response.read()
+                if response.status == 200:
+                    return True
+            except (OSError, http.client.HTTPException):
+                conn.close()
+            if i < max_attempts - 1:
+                time.sleep(delay)
+                delay = min(delay * 2, 0.5)
+        return False
+    finally:
+        conn.close()
+
+def pytest_sessionstart(session):
+    """Ensure API is running before tests
+
+    Runs once in the main process, before any pytest-xdist workers start, so
+    a down API ends the whole run straight away. Skipped when only offline
+    test files were selected.
+    """
+    if hasattr(session.config, "workerinput") or session.config.option.collectonly:
+        return
+    args = session.config.args
+    if args and all(Path(arg.split("::")[0]).name in OFFLINE_TESTS for arg in args):
+        return
+    if not wait_for_api():
+        pytest.exit("API server is not running. Start it with: python start_server.py")
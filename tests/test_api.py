@@ -1,101 +1,195 @@
 # Blackbox Testing Suite
 
-import sys
-from pathlib import Path
-
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import uuid
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
 
+import orjson
 import pytest
-import requests
-from backend.models import EventType, RunStatus
-import time
-
-# Test configuration
-API_URL = "http://localhost:8000"
-TEST_TIMEOUT = 5  # seconds
-
-def wait_for_api(max_attempts=10):
-    """Wait for API to be available"""
-    for i in range(max_attempts):
-        try:
-            response = requests.get(f"{API_URL}/health", timeout=TEST_TIMEOUT)
-            if response.status_code == 200:
-                return True
-        except requests.exceptions.RequestException:
-            if i < max_attempts - 1:
-                time.sleep(1)
-    return False
-
-@pytest.fixture(scope="session", autouse=True)
-def check_api():
-    """Ensure API is running before tests"""
-    if not wait_for_api():
-        pytest.exit("API server is not running. Start it with: python start_server.py")
+
+# Test configuration; conftest.py checks the API is up before the run starts
+from conftest import API_URL
+
+ROOT_URL = f"{API_URL}/"
+HEALTH_URL = f"{API_URL}/health"
+HEALTH_FULL_URL = f"{API_URL}/health/full"
+USERS_URL = f"{API_URL}/users"
+PROJECTS_URL = f"{API_URL}/projects"
+EVENTS_URL = f"{API_URL}/events"
+STATS_URL = f"{API_URL}/stats/summary"
+BATCH_URL = f"{API_URL}/batch"
+SESSIONS_URL = f"{API_URL}/sessions"
+RUNS_URL = f"{API_URL}/runs"
+TEST_TIMEOUT = 2  # seconds
+
+_STATS_KEYS = frozenset({
+    "total_users", "total_projects", "total_sessions", "total_snippets",
+    "total_runs", "total_events", "runs_by_status", "events_by_type",
+})
+
+def uniq(prefix):
+    """Name that is unique across runs and xdist workers"""
+    return f"{prefix}_{uuid.uuid4().hex}"
+
+def api_json(response):
+    """Decode a response body with orjson"""
+    return orjson.loads(response.content)
+
+def bulk_post(api, url, payloads, workers=8):
+    """POST payloads concurrently and return the decoded responses in order.
+
+    Safe on the shared session as long as workers <= the adapter's pool_maxsize.
+    """
+    with ThreadPoolExecutor(workers) as ex:
+        return list(ex.map(
+            lambda p: api.post(url, json=p, timeout=TEST_TIMEOUT).json(),
+            payloads,
+        ))
+
+@pytest.fixture(scope="session")
+def api():
+    """One keep-alive session shared by every test in the worker"""
+    # Imported here so --collect-only doesn't pay for requests/urllib3
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    s = requests.Session()
+    s.headers["Connection"] = "keep-alive"
+    s.mount("http://", HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=32,
+        max_retries=Retry(total=2, backoff_factor=0.05),
+    ))
+    yield s
+    s.close()
+
+@pytest.fixture(scope="session")
+def shared_project(api):
+    """Project created once per run for tests that only need one to exist"""
+    response = api.post(
+        PROJECTS_URL,
+        json={"name": uniq("shared")}
+    )
+    return response.json()["id"]
+
+@pytest.fixture(scope="module")
+def seeded(api):
+    """One user owning three projects, with three events on the first project"""
+    user_id = api.post(USERS_URL, json={"username": uniq("seed")}).json()["id"]
+    projects = bulk_post(api, PROJECTS_URL, [
+        {"name": uniq(f"p{i}"), "owner_id": user_id} for i in range(3)
+    ])
+    project_ids = [p["id"] for p in projects]
+    events = bulk_post(api, EVENTS_URL, [
+        {"project_id": project_ids[0], "event_type": "info", "message": f"seed event {i}"}
+        for i in range(3)
+    ])
+    return SimpleNamespace(
+        user_id=user_id,
+        project_ids=project_ids,
+        event_ids=[e["id"] for e in events],
+    )
+
+# Read-only tests marked vcr replay their recorded responses from
+# tests/cassettes/; run with --record-mode=all to refresh them from the API.
+@pytest.mark.vcr
+@pytest.mark.parametrize("url,shape", [
+    (ROOT_URL, dict),
+    (HEALTH_URL, dict),
+    (USERS_URL, list),
+    (PROJECTS_URL, list),
+    (EVENTS_URL, list),
+], ids=["root", "health", "users", "projects", "events"])
+def test_get_ok(api, url, shape):
+    """Test GET endpoints return 200 with JSON of the expected shape"""
+    response = api.get(url)
+    assert response.status_code == 200
+    assert isinstance(api_json(response), shape)
 
 class TestHealthCheck:
-    def test_root_endpoint(self):
+    def test_root_endpoint(self, api):
         """Test root endpoint returns health status"""
-        response = requests.get(f"{API_URL}/")
+        response = api.get(ROOT_URL)
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "healthy"
         assert "version" in data
     
-    def test_health_endpoint(self):
+    def test_health_endpoint(self, api):
         """Test health check endpoint"""
-        response = requests.get(f"{API_URL}/health")
+        response = api.get(HEALTH_FULL_URL)
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "healthy"
         assert data["database"] == "connected"
 
 class TestUserEndpoints:
-    def test_create_user(self):
+    def test_create_user(self, api):
         """Test user creation"""
-        response = requests.post(
-            f"{API_URL}/users",
-            json={"username": f"test_user_{int(time.time())}"}
+        response = api.post(
+            USERS_URL,
+            json={"username": uniq("test_user")}
         )
         assert response.status_code == 201
         data = response.json()
         assert "id" in data
         assert "username" in data
     
-    def test_create_duplicate_user(self):
+    # Relies on write ordering; --dist=loadgroup pins the group to one worker.
+    # worksteal ignores groups, which is safe as both POSTs happen in this test.
+    @pytest.mark.xdist_group(name="serial-writes")
+    def test_create_duplicate_user(self, api):
         """Test that duplicate usernames are rejected"""
-        username = f"duplicate_user_{int(time.time())}"
+        username = uniq("duplicate_user")
         
         # Create first user
-        response1 = requests.post(f"{API_URL}/users", json={"username": username})
+        response1 = api.post(USERS_URL, json={"username": username})
         assert response1.status_code == 201
         
         # Try to create duplicate
-        response2 = requests.post(f"{API_URL}/users", json={"username": username})
+        response2 = api.post(USERS_URL, json={"username": username})
         assert response2.status_code == 400
     
-    def test_list_users(self):
-        """Test listing users"""
-        response = requests.get(f"{API_URL}/users")
+    def test_list_users_pagination(self, api):
+        """Test user pagination"""
+        bulk_post(api, USERS_URL, [{"username": uniq("page_user")} for _ in range(5)])
+        response = api.get(USERS_URL, params={"skip": 0, "limit": 5})
         assert response.status_code == 200
-        users = response.json()
+        users = api_json(response)
         assert isinstance(users, list)
+        assert len(users) == 5
+
+    def test_list_users_after_id(self, api):
+        """Test keyset paging returns the users after the given id, in id order"""
+        users = bulk_post(api, USERS_URL, [{"username": uniq("after_user")} for _ in range(3)])
+        ids = sorted(u["id"] for u in users)
+        response = api.get(USERS_URL, params={"after_id": ids[0], "limit": 2})
+        assert response.status_code == 200
+        page = [u["id"] for u in api_json(response)]
+        assert len(page) == 2
+        assert page == sorted(page) and page[0] > ids[0]
+        # Other workers may add users in between, but none can come after ids[1]
+        assert page[0] <= ids[1]
     
-    def test_list_users_pagination(self):
-        """Test user pagination"""
-        response = requests.get(f"{API_URL}/users?skip=0&limit=5")
+    def test_get_user_by_name(self, api):
+        """Test looking a user up by a name containing a slash"""
+        username = uniq("team/alice")
+        user_id = api.post(USERS_URL, json={"username": username}).json()["id"]
+        response = api.get(f"{USERS_URL}/by-name/{quote(username, safe='')}")
         assert response.status_code == 200
-        users = response.json()
-        assert isinstance(users, list)
-        assert len(users) <= 5
+        assert api_json(response)["id"] == user_id
+        missing = api.get(f"{USERS_URL}/by-name/{quote(uniq('nobody'), safe='')}")
+        assert missing.status_code == 404
 
 class TestProjectEndpoints:
-    def test_create_project(self):
+    def test_create_project(self, api):
         """Test project creation"""
-        response = requests.post(
-            f"{API_URL}/projects",
+        response = api.post(
+            PROJECTS_URL,
             json={
-                "name": f"Test Project {int(time.time())}",
+                "name": uniq("test_project"),
                 "description": "A test project"
             }
         )
@@ -104,28 +198,28 @@ class TestProjectEndpoints:
         assert "id" in data
         assert "name" in data
     
-    def test_list_projects(self):
-        """Test listing projects"""
-        response = requests.get(f"{API_URL}/projects")
+    def test_get_project_by_name(self, api):
+        """Test looking a project up by a name containing a slash"""
+        name = uniq("org/repo")
+        project_id = api.post(PROJECTS_URL, json={"name": name}).json()["id"]
+        response = api.get(f"{PROJECTS_URL}/by-name/{quote(name, safe='')}")
+        assert response.status_code == 200
+        assert api_json(response)["id"] == project_id
+    
+    def test_list_projects(self, api, seeded):
+        """Test listing projects returns the seeded ones"""
+        response = api.get(PROJECTS_URL, params={"owner_id": seeded.user_id})
         assert response.status_code == 200
-        projects = response.json()
-        assert isinstance(projects, list)
+        projects = api_json(response)
+        assert {p["id"] for p in projects} == set(seeded.project_ids)
 
 class TestEventEndpoints:
-    def test_create_event(self):
+    def test_create_event(self, api, shared_project):
         """Test event creation"""
-        # First create a project
-        project_response = requests.post(
-            f"{API_URL}/projects",
-            json={"name": f"Event Test Project {int(time.time())}"}
-        )
-        project_id = project_response.json()["id"]
-        
-        # Create event
-        response = requests.post(
-            f"{API_URL}/events",
+        response = api.post(
+            EVENTS_URL,
             json={
-                "project_id": project_id,
+                "project_id": shared_project,
                 "event_type": "info",
                 "message": "Test event",
                 "metadata_json": '{"test": true}'
@@ -136,34 +230,156 @@ class TestEventEndpoints:
         assert "id" in data
         assert "timestamp" in data
     
-    def test_list_events(self):
-        """Test listing events"""
-        response = requests.get(f"{API_URL}/events")
+    def test_bulk_create_events(self, api):
+        """Test creating several events in one request"""
+        project_id = api.post(PROJECTS_URL, json={"name": uniq("bulk_project")}).json()["id"]
+        messages = [f"bulk event {i}" for i in range(3)]
+        response = api.post(f"{EVENTS_URL}/bulk", json=[
+            {"project_id": project_id, "event_type": "info", "message": m} for m in messages
+        ])
+        assert response.status_code == 201
+        assert api_json(response) == {"created": 3}
+        events = api.get(EVENTS_URL, params={"project_id": project_id}).json()
+        assert [e["message"] for e in events] == messages
+    
+    def test_bulk_create_unknown_project(self, api, shared_project):
+        """Test bulk event creation rejects unknown projects like POST /events"""
+        before = api.get(EVENTS_URL, params={"project_id": shared_project}).json()
+        response = api.post(f"{EVENTS_URL}/bulk", json=[
+            {"project_id": shared_project, "event_type": "info"},
+            {"project_id": 999999999, "event_type": "info"},
+        ])
+        assert response.status_code == 404
+        after = api.get(EVENTS_URL, params={"project_id": shared_project}).json()
+        assert len(after) == len(before)
+    
+    def test_list_events(self, api, seeded):
+        """Test listing events returns the seeded ones"""
+        response = api.get(EVENTS_URL, params={"project_id": seeded.project_ids[0]})
+        assert response.status_code == 200
+        events = api_json(response)
+        assert {e["id"] for e in events} == set(seeded.event_ids)
+
+    def test_list_events_summary(self, api, seeded):
+        """Test summary=true leaves out the event metadata"""
+        params = {"project_id": seeded.project_ids[0]}
+        full = api_json(api.get(EVENTS_URL, params=params))
+        summary = api_json(api.get(EVENTS_URL, params={**params, "summary": "true"}))
+        assert "metadata_json" in full[0]
+        assert all("metadata_json" not in e for e in summary)
+        assert [e["id"] for e in summary] == [e["id"] for e in full]
+
+class TestRunEndpoints:
+    def test_update_run_clears_field(self, api, shared_project):
+        """Test PATCH only touches sent fields, and an explicit null clears one"""
+        session_id = api.post(SESSIONS_URL, json={"project_id": shared_project}).json()["id"]
+        run_id = api.post(RUNS_URL, json={"session_id": session_id}).json()["id"]
+        response = api.patch(f"{RUNS_URL}/{run_id}", json={"stdout": "hello", "duration": 1.5})
         assert response.status_code == 200
-        events = response.json()
-        assert isinstance(events, list)
+
+        response = api.patch(f"{RUNS_URL}/{run_id}", json={"stdout": None})
+        assert response.status_code == 200
+        run = api.get(f"{RUNS_URL}/{run_id}").json()
+        assert run["stdout"] is None
+        assert run["duration"] == 1.5
+
+        response = api.patch(f"{RUNS_URL}/{run_id}", json={"status": None})
+        assert response.status_code == 422
+        assert api.get(f"{RUNS_URL}/{run_id}").json()["status"] == run["status"]
 
 class TestStatsEndpoint:
-    def test_stats_summary(self):
+    @pytest.mark.vcr
+    def test_stats_summary(self, api):
         """Test stats summary endpoint"""
-        response = requests.get(f"{API_URL}/stats/summary")
+        response = api.get(STATS_URL)
         assert response.status_code == 200
-        data = response.json()
+        data = api_json(response)
         
         # Check all expected fields are present
-        assert "total_users" in data
-        assert "total_projects" in data
-        assert "total_sessions" in data
-        assert "total_snippets" in data
-        assert "total_runs" in data
-        assert "total_events" in data
-        assert "runs_by_status" in data
-        assert "events_by_type" in data
+        missing = _STATS_KEYS - data.keys()
+        assert not missing, f"missing: {missing}"
         
         # Check values are non-negative integers
         assert data["total_users"] >= 0
-        assert isinstance(data["runs_by_status"], dict)
-        assert isinstance(data["events_by_type"], dict)
+        assert isinstance(data["runs_by_status"], dict) and isinstance(data["events_by_type"], dict)
+
+class TestBatchEndpoint:
+    def test_batch_ref_chaining(self, api):
+        """Test {"$ref": "N.id"} passes ids from earlier calls"""
+        response = api.post(BATCH_URL, json=[
+            {"method": "POST", "path": "/users", "payload": {"username": uniq("batch_user")}},
+            {"method": "POST", "path": "/projects", "payload": {
+                "name": uniq("batch_project"), "owner_id": {"$ref": "0.id"}
+            }},
+            {"method": "GET", "path": "/projects/$1.id"},
+        ])
+        assert response.status_code == 200
+        user, project, fetched = api_json(response)
+        assert [user["status"], project["status"], fetched["status"]] == [201, 201, 200]
+        assert fetched["body"]["id"] == project["body"]["id"]
+        assert fetched["body"]["owner_id"] == user["body"]["id"]
+    
+    def test_batch_bulk_events_keep_order(self, api):
+        """Test events sent as one bulk call get ids in submission order"""
+        messages = [f"ordered event {i}" for i in range(10)]
+        response = api.post(BATCH_URL, json=[
+            {"method": "POST", "path": "/projects", "payload": {"name": uniq("order_project")}},
+            {"method": "POST", "path": "/events/bulk", "payload": [
+                {"project_id": {"$ref": "0.id"}, "event_type": "info", "message": m} for m in messages
+            ]},
+        ])
+        assert response.status_code == 200
+        project, bulk = api_json(response)
+        assert bulk["status"] == 201
+        events = api.get(EVENTS_URL, params={"project_id": project["body"]["id"]}).json()
+        events.sort(key=lambda e: e["id"])
+        assert [e["message"] for e in events] == messages
+    
+    def test_batch_failed_dependency(self, api):
+        """Test calls depending on a failed call get 424"""
+        response = api.post(BATCH_URL, json=[
+            {"method": "GET", "path": "/projects/999999999"},
+            {"method": "POST", "path": "/events", "payload": {
+                "project_id": {"$ref": "0.id"}, "event_type": "info"
+            }},
+            {"method": "GET", "path": "/events", "input_from": 1},
+        ])
+        assert response.status_code == 200
+        assert [r["status"] for r in api_json(response)] == [404, 424, 424]
+    
+    def test_batch_dollar_in_message(self, api, shared_project):
+        """Test text that looks like a reference is stored as written"""
+        messages = ["Raise fee to $1.25", "$0.9", "$5.id"]
+        response = api.post(BATCH_URL, json=[
+            {"method": "POST", "path": "/events", "payload": {
+                "project_id": shared_project, "event_type": "info", "message": message
+            }}
+            for message in messages
+        ])
+        assert response.status_code == 200
+        results = api_json(response)
+        assert [r["status"] for r in results] == [201] * len(messages)
+        for result, message in zip(results, messages):
+            event = api.get(f"{EVENTS_URL}/{result['body']['id']}").json()
+            assert event["message"] == message
+    
+    def test_batch_non_json_response(self, api):
+        """Test a non-JSON sub-response is reported on its own call"""
+        response = api.post(BATCH_URL, json=[
+            {"method": "GET", "path": "/docs"},
+            {"method": "GET", "path": "/"},
+        ])
+        assert response.status_code == 200
+        docs, root = api_json(response)
+        assert docs["status"] == 200 and isinstance(docs["body"], str)
+        assert root["body"]["status"] == "healthy"
+    
+    def test_batch_rejects_nesting(self, api):
+        """Test a batch cannot contain another batch"""
+        inner = [{"method": "GET", "path": "/"}]
+        for path in ["/batch", "/%62atch", "//batch/"]:
+            response = api.post(BATCH_URL, json=[{"method": "POST", "path": path, "payload": inner}])
+            assert response.status_code == 400, path
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
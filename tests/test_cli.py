@@ -0,0 +1,255 @@
+# Blackbox CLI tests: these run without the API server
+
+import os
+import queue
+import re
+import signal
+import socket
+import socketserver
+import threading
+import time
+
+import pytest
+
+import config
+from blackbox import cli
+
+class FakeClient:
+    """Stands in for BlackboxClient: batch() answers each call with respond(call)
+
+    Like the API, a call referring to a failed call's result gets a 424.
+    """
+    base_url = "http://api.test"
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.batches = []
+
+    def batch(self, calls):
+        self.batches.append(calls)
+        results = []
+        for call in calls:
+            refs = re.findall(r'"\$ref":"(\d+)\.', cli._dumps(call.get("payload")).decode())
+            if any(results[int(i)]["status"] >= 400 for i in refs):
+                results.append({"status": 424, "body": {"detail": "A call this one depends on failed"}})
+            else:
+                results.append(self.respond(call))
+        return results
+
+def api_stub(call):
+    """Unknown names are 404s; anything created gets id 7"""
+    if call.get("method", "GET") == "GET":
+        return {"status": 404, "body": {"detail": "Not found"}}
+    if call["path"] == "/events/bulk":
+        return {"status": 201, "body": {"created": len(call["payload"])}}
+    return {"status": 201, "body": {"id": 7}}
+
+@pytest.fixture(autouse=True)
+def cache_file(tmp_path, monkeypatch):
+    """Keep the hooks' name -> id cache out of the real home directory"""
+    path = tmp_path / "cache.json"
+    monkeypatch.setattr(cli, "CACHE_FILE", path)
+    return path
+
+def events(*projects):
+    return [cli.hook_event(project, "info", f"event {i}", "alice") for i, project in enumerate(projects)]
+
+class TestLogHookEvents:
+    def test_events_sent_in_order(self):
+        """Test known and new projects' events go out as one bulk call, in order"""
+        cli._cache_update({"http://api.test|alice|known": {"user_id": 1, "project_id": 2}})
+        client = FakeClient(api_stub)
+        cli.log_hook_events(client, events("known", "new", "known"))
+
+        calls = client.batches[-1]
+        assert [c["path"] for c in calls] == ["/users", "/projects", "/events/bulk"]
+        payload = calls[-1]["payload"]
+        assert [e["message"] for e in payload] == ["event 0", "event 1", "event 2"]
+        assert [e["project_id"] for e in payload] == [2, {"$ref": "1.id"}, 2]
+        assert cli._load_cache()["http://api.test|alice|new"] == {"user_id": 7, "project_id": 7}
+
+    def test_cached_events_need_one_batch(self):
+        """Test events for cached pairs skip the lookups"""
+        cli._cache_update({"http://api.test|alice|known": {"user_id": 1, "project_id": 2}})
+        client = FakeClient(api_stub)
+        cli.log_hook_events(client, events("known", "known"))
+        assert [[c["path"] for c in calls] for calls in client.batches] == [["/events/bulk"]]
+
+    def test_lost_user_race_resolves_again(self):
+        """Test a user created by another hook meanwhile is looked up, not lost"""
+        lookups = []
+
+        def respond(call):
+            if call["path"].startswith("/users/by-name/"):
+                lookups.append(call)
+                if len(lookups) > 1:  # the other hook's user exists by now
+                    return {"status": 200, "body": {"id": 3}}
+            if call["path"] == "/users":
+                return {"status": 400, "body": {"detail": "Username already exists"}}
+            return api_stub(call)
+
+        client = FakeClient(respond)
+        cli.log_hook_events(client, events("new"))
+        assert len(lookups) == 2
+        assert [c["path"] for c in client.batches[-1]] == ["/projects", "/events/bulk"]
+        assert client.batches[-1][0]["payload"]["owner_id"] == 3
+        assert cli._load_cache()["http://api.test|alice|new"] == {"user_id": 3, "project_id": 7}
+
+    def test_stale_cache_resolves_again(self):
+        """Test a 404 for a cached project drops the pair and looks it up by name"""
+        cli._cache_update({"http://api.test|alice|gone": {"user_id": 1, "project_id": 2}})
+
+        def respond(call):
+            if call["path"] == "/events/bulk" and call["payload"][0]["project_id"] == 2:
+                return {"status": 404, "body": {"detail": "Project not found: [2]"}}
+            if call["path"].startswith("/users/by-name/"):
+                return {"status": 200, "body": {"id": 4}}
+            if call["path"].startswith("/projects/by-name/"):
+                return {"status": 200, "body": {"id": 5}}
+            return api_stub(call)
+
+        client = FakeClient(respond)
+        cli.log_hook_events(client, events("gone"))
+        assert [[c["path"] for c in calls] for calls in client.batches] == [
+            ["/events/bulk"],
+            ["/users/by-name/alice", "/projects/by-name/gone"],
+            ["/events/bulk"],
+        ]
+        assert client.batches[-1][0]["payload"][0]["project_id"] == 5
+        assert cli._load_cache()["http://api.test|alice|gone"] == {"user_id": 4, "project_id": 5}
+
+    def test_cache_update(self, cache_file):
+        """Test _cache_update merges into the file and None removes a key"""
+        cli._cache_update({"a": 1, "b": 2})
+        cli._cache_update({"a": None, "c": 3})
+        assert cli._load_cache() == {"b": 2, "c": 3}
+        assert [p.name for p in cache_file.parent.iterdir()] == [cache_file.name]
+
+class TestClientCache:
+    @pytest.fixture
+    def client(self):
+        client = cli.BlackboxClient("http://api.test")
+        for endpoint in ["/users", "/users/by-name/bob", "/projects", "/events", "/stats/summary"]:
+            client._get_cache[(endpoint, ())] = {}
+        return client
+
+    def cached(self, client):
+        return [endpoint for endpoint, _ in client._get_cache]
+
+    def test_write_drops_its_family_and_stats(self, client):
+        """Test POST /users forgets the cached user lookups and the stats only"""
+        client.invalidate("/users")
+        assert self.cached(client) == ["/projects", "/events"]
+
+    def test_write_with_query_string(self, client):
+        """Test the family ignores the query string"""
+        client.invalidate("/events?project_id=1")
+        assert self.cached(client) == ["/users", "/users/by-name/bob", "/projects"]
+
+    @pytest.mark.parametrize("endpoint", [None, "/batch"])
+    def test_batch_drops_everything(self, client, endpoint):
+        """Test a batch, which can write to anything, clears the whole cache"""
+        client.invalidate(endpoint)
+        assert self.cached(client) == []
+
+class TestDaemon:
+    def test_next_batch_stops_at_size(self, monkeypatch):
+        """Test a batch holds at most DAEMON_BATCH_SIZE events"""
+        monkeypatch.setattr(cli, "DAEMON_BATCH_SIZE", 3)
+        q = queue.Queue()
+        for i in range(5):
+            q.put(i)
+        assert cli._next_batch(q, object()) == [0, 1, 2]
+        assert cli._next_batch(q, object()) == [3, 4]
+
+    def test_next_batch_ends_at_stop(self):
+        """Test nothing is taken after the stop marker"""
+        stop = object()
+        q = queue.Queue()
+        for item in ["a", stop, "b"]:
+            q.put(item)
+        assert cli._next_batch(q, stop) == ["a", stop]
+
+    def test_daemon_sends_queued_events(self, tmp_path, monkeypatch):
+        """Test requests sent to the socket reach the API in the order they came in"""
+        servers = []
+
+        class Server(socketserver.ThreadingUnixStreamServer):
+            def __init__(self, *args):
+                super().__init__(*args)
+                servers.append(self)
+
+        monkeypatch.setattr(socketserver, "ThreadingUnixStreamServer", Server)
+        monkeypatch.setattr(signal, "signal", lambda *args: None)  # main thread only
+        path = str(tmp_path / "blackbox.sock")
+        client = FakeClient(api_stub)
+        daemon = threading.Thread(target=cli.run_daemon, args=(client, path))
+        daemon.start()
+        while not servers:
+            time.sleep(0.01)
+
+        replies = []
+        for request in [b'{"command":"auto-commit","project":"p","message":"one"}',
+                        b'{"command":"auto-event","project":"p","type":"info","message":"two"}',
+                        b'{"command":"auto-event","project":"p","type":"bogus","message":"x"}']:
+            with socket.socket(socket.AF_UNIX) as conn:
+                conn.connect(path)
+                conn.sendall(request + b"\n")
+                replies.append(cli._loads(conn.makefile("rb").readline()))
+        servers[0].shutdown()
+        daemon.join()
+
+        assert [r["ok"] for r in replies] == [True, True, False]
+        sent = [e["message"] for calls in client.batches if calls[-1]["path"] == "/events/bulk"
+                for e in calls[-1]["payload"]]
+        assert sent == ["Commit: one", "two"]
+
+    def test_daemon_leaves_other_users_socket(self, tmp_path, monkeypatch):
+        """Test the daemon refuses a socket path owned by someone else"""
+        path = tmp_path / "blackbox.sock"
+        with socket.socket(socket.AF_UNIX) as other:
+            other.bind(str(path))
+        monkeypatch.setattr(os, "getuid", lambda: os.lstat(path).st_uid + 1)
+        with pytest.raises(SystemExit):
+            cli.run_daemon(FakeClient(api_stub), str(path))
+        assert path.exists()
+
+class TestEnvCache:
+    @pytest.fixture(autouse=True)
+    def isolated(self, tmp_path, monkeypatch):
+        """Cache file under tmp_path, and an environment the test can throw away"""
+        pytest.importorskip("dotenv")
+        monkeypatch.setattr(config, "ENV_CACHE_FILE", tmp_path / "env.cache")
+        monkeypatch.setattr(os, "environ", {})
+
+    def test_unchanged_file_uses_cache(self, tmp_path):
+        """Test a .env with the same mtime and size is not parsed again"""
+        env = tmp_path / ".env"
+        env.write_text("BLACKBOX_X=1\n")
+        config._load_env(env)
+        assert os.environ["BLACKBOX_X"] == "1"
+
+        cache = cli._loads(config.ENV_CACHE_FILE.read_bytes())
+        cache[str(env)]["values"] = {"BLACKBOX_X": "cached"}
+        config.ENV_CACHE_FILE.write_bytes(cli._dumps(cache))
+        os.environ.clear()
+        config._load_env(env)
+        assert os.environ["BLACKBOX_X"] == "cached"
+
+    def test_changed_file_is_parsed_again(self, tmp_path):
+        """Test editing the .env invalidates its cached values"""
+        env = tmp_path / ".env"
+        env.write_text("BLACKBOX_X=1\n")
+        config._load_env(env)
+        env.write_text("BLACKBOX_X=22\n")
+        os.environ.clear()
+        config._load_env(env)
+        assert os.environ["BLACKBOX_X"] == "22"
+
+    def test_environment_wins(self, tmp_path):
+        """Test variables already set are not overridden by the .env"""
+        env = tmp_path / ".env"
+        env.write_text("BLACKBOX_X=1\n")
+        os.environ["BLACKBOX_X"] = "set"
+        config._load_env(env)
+        assert os.environ["BLACKBOX_X"] == "set"